@@ -1,14 +1,41 @@
 
 # (c) 2024 Roland Labana
 
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import os
 import random
-import pygame
+import struct
 import sys
 import time
+import tracemalloc
+from array import array
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # only needed by the batch simulator
+    np = None
 
 PRINT_ON = False
 DEBUG_PRINT_ON = False
 DRAW_GRAPHICS = False
+GRAPHICS_FPS = 30     # window redraws per second - it has its own process, games don't wait for it
+GRAPHICS_EVERY = 1    # only draw every Nth game (1 = all of them)
+NUM_WORKERS = 1   # processes to play the games on, 0 = one per CPU core
+GAME_LOG_PATH = None  # e.g. "games.tttlog" to record every game played (see GameLogReader)
+BOARD_SIZE = 3    # squares per side, 4 = 4x4 board and so on
+WIN_LENGTH = 3    # in a row needed to win (capped at BOARD_SIZE)
 
 def print_on(s):
     if PRINT_ON == True:
@@ -35,7 +62,7 @@ class HumanPlayer(Player):
      def make_move(self, game):
         while True:
             try:
-                move = int(input(f"Enter your move for '{self.symbol}' (0-8): "))
+                move = int(input(f"Enter your move for '{self.symbol}' (0-{len(game.board)-1}): "))
                 if game.is_valid_move(move):
                     game.make_move(move, self.symbol)
                     break
@@ -55,53 +82,355 @@ class AIPlayer(Player):
         debug_print_on(f"{self.symbol}'s AI is thinking...")
 
         #first move random so the same game is not played over and over
+        player1, player2 = game.players
         if player1.movecount == 1: 
             player1.movecount = -1  #don't care about movecount after this
             player2.movecount = -1
-            game.make_move(random.randint(0,8), self.symbol)
+            game.make_move(random.randint(0,len(game.board)-1), self.symbol)
             print_on ("P1 First move random")
             return   
 
+        stats = getattr(self.strategy, 'stats', None)  # time the move if the strategy keeps SearchStats
+        start = time.perf_counter() if stats is not None else 0
         move = self.strategy.determine_move(game)
+        if stats is not None:
+            stats.record_move(time.perf_counter() - start)
         if game.is_valid_move(move):
             game.make_move(move, self.symbol)
         else:
             print(f"Error: Invalid move suggested by {self.symbol}'s AI. Defaulting to random move.")
             # Default to random move if AI suggests an invalid move
-            for i in range(9):
+            for i in range(len(game.board)):
                 if game.is_valid_move(i):
                     game.make_move(i, self.symbol)
                     break
 
+#-------------------------------- Board core ----------------------
+# game.board is still a list of ' ', 'X' and 'O' so every strategy keeps working
+# with game.board[i], game.board[:], ''.join(game.board) and so on.  Underneath,
+# every write also updates one bitmask per player (bit i set = that player owns
+# square i), a mask of the empty squares and the base-3 index of the position
+# (' ' = 0, 'X' = 1, 'O' = 2).
+# On the 3x3 board a win check is then one WIN_TABLE lookup.  Bigger boards also
+# keep a count of complete lines - only the lines through the square just
+# written can have been completed (or broken), so check_win never rescans them.
+#
+# The board can be any size (size x size squares, win_length in a row wins);
+# the constants below are for the classic 3x3 game.
+
+WIN_CONDITIONS = [
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
+    [0, 4, 8], [2, 4, 6]  # Diagonals
+]
+WIN_MASKS = [sum(1 << i for i in combo) for combo in WIN_CONDITIONS]
+FULL_MASK = (1 << 9) - 1
+BIT = [1 << i for i in range(9)]
+POW3 = [3 ** i for i in range(9)]
+SYMBOL_VALUE = {' ': 0, 'X': 1, 'O': 2}
+
+# WIN_TABLE[mask] is True if the squares set in mask contain a complete line
+WIN_TABLE = [any(mask & w == w for w in WIN_MASKS) for mask in range(FULL_MASK + 1)]
+
+# Everything about a board size that doesn't change during a game
+class BoardGeometry:
+    def __init__(self, size, win_length):
+        if not 1 <= win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}")
+        self.size = size
+        self.win_length = win_length
+        self.squares = size * size
+        self.full_mask = (1 << self.squares) - 1
+        self.pow3 = [3 ** i for i in range(self.squares)]
+
+        # every win_length run of squares: rows, columns, then both diagonals
+        self.lines = []
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for r in range(size):
+                for c in range(size):
+                    end_r, end_c = r + dr * (win_length - 1), c + dc * (win_length - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        self.lines.append([(r + dr * j) * size + c + dc * j for j in range(win_length)])
+        self.line_masks = [sum(1 << i for i in line) for line in self.lines]
+
+        # masks_through[square] = masks of the lines that square is on, lines_through the line numbers
+        self.masks_through = [[mask for mask in self.line_masks if mask >> square & 1] for square in range(self.squares)]
+        self.lines_through = [[number for number, mask in enumerate(self.line_masks) if mask >> square & 1]
+                              for square in range(self.squares)]
+
+        # a line's pattern number is its squares in base 3 (' ' = 0, 'X' = 1, 'O' = 2), first square
+        # lowest; line_digits[square] = [(line number, 3 ** square's place in it), ...]
+        self.line_digits = [[(number, 3 ** line.index(square)) for number, line in enumerate(self.lines) if square in line]
+                            for square in range(self.squares)]
+
+        # square_lists[mask] = the squares in mask, lowest first - only for boards of up
+        # to 9 squares, bigger ones work it out each time (see BitBoard.empty_squares)
+        self.square_lists = None
+        if self.squares <= 9:
+            self.square_lists = [tuple(i for i in range(self.squares) if mask >> i & 1) for mask in range(self.full_mask + 1)]
+
+        # squares on more lines first: center, corners, edges on the 3x3 board
+        self.move_order = sorted(range(self.squares), key=lambda square: -len(self.masks_through[square]))
+        middle = [(size - 1) // 2, size // 2]
+        self.center = sorted({r * size + c for r in middle for c in middle})
+        self.corners = [0, size - 1, self.squares - size, self.squares - 1]
+        self.center_mask = sum(1 << i for i in self.center)
+        self.corner_mask = sum(1 << i for i in set(self.corners))
+
+    # Would owning mask (which includes square) make a line through square?
+    def completes(self, mask, square):
+        for line_mask in self.masks_through[square]:
+            if mask & line_mask == line_mask:
+                return True
+        return False
+
+    # How many lines through square are complete in mask
+    def lines_completed(self, mask, square):
+        count = 0
+        for line_mask in self.masks_through[square]:
+            if mask & line_mask == line_mask:
+                count += 1
+        return count
+
+_geometries = {}
+
+def board_geometry(size=3, win_length=None):
+    key = (size, win_length or size)
+    if key not in _geometries:
+        _geometries[key] = BoardGeometry(*key)
+    return _geometries[key]
+
+CLASSIC = board_geometry(3, 3)
+
+def board_masks(theBoard):
+    # (x_bits, o_bits) for any list-like board
+    x_bits = o_bits = 0
+    for i, symbol in enumerate(theBoard):
+        if symbol == 'X':
+            x_bits |= 1 << i
+        elif symbol == 'O':
+            o_bits |= 1 << i
+    return x_bits, o_bits
+
+def board_index(theBoard):
+    # base-3 position index, 0 .. 3**squares - 1
+    return sum(SYMBOL_VALUE[symbol] * 3 ** i for i, symbol in enumerate(theBoard))
+
+class BitBoard(list):
+    def __init__(self, squares=None, geometry=CLASSIC):
+        super().__init__(squares if squares is not None else [' '] * geometry.squares)
+        if len(self) != geometry.squares:
+            raise ValueError(f"Board should have exactly {geometry.squares} positions.")
+        self.geometry = geometry
+        self.line_states = None  # per-line pattern numbers, only while track_lines is on
+        self.resync()
+
+    # Recompute the masks, index and win count from the list contents
+    def resync(self):
+        self.x_bits, self.o_bits = board_masks(self)
+        self.empty = self.geometry.full_mask & ~(self.x_bits | self.o_bits)
+        self.index = board_index(self)
+        self.wins = sum(1 for mask in self.geometry.line_masks
+                        if self.x_bits & mask == mask or self.o_bits & mask == mask)  # complete lines, not kept up on 3x3
+        if self.line_states is not None:
+            self.line_states = None
+            self.track_lines()
+
+    # While on, the board also keeps every line's pattern number (see
+    # BoardGeometry) in line_states, so an evaluation can look each line up in
+    # a table instead of reading its squares (see Heuristic).  Off by default
+    # since it slows every move a bit.
+    def track_lines(self, on=True):
+        if not on:
+            self.line_states = None
+            return
+        if self.line_states is not None:
+            return
+        self.line_states = [sum(SYMBOL_VALUE[self[square]] * 3 ** place for place, square in enumerate(line))
+                            for line in self.geometry.lines]
+
+    # How many squares have a mark on them
+    @property
+    def filled(self):
+        return self.geometry.squares - bin(self.empty).count('1')
+
+    # The empty squares, lowest first
+    def empty_squares(self):
+        square_lists = self.geometry.square_lists
+        if square_lists is not None:
+            return square_lists[self.empty]
+        empty = self.empty
+        return [i for i in range(self.geometry.squares) if empty >> i & 1]
+
+    def __setitem__(self, i, symbol):
+        if type(i) is not int:  # slice assignment - rare, just rebuild everything
+            list.__setitem__(self, i, symbol)
+            self.resync()
+            return
+        geometry = self.geometry
+        if i < 0:
+            i += geometry.squares
+        old = list.__getitem__(self, i)
+        list.__setitem__(self, i, symbol)
+        bit = 1 << i
+        if old == 'X':
+            self.x_bits ^= bit
+        elif old == 'O':
+            self.o_bits ^= bit
+        else:
+            self.empty ^= bit
+        if symbol == 'X':
+            self.x_bits |= bit
+        elif symbol == 'O':
+            self.o_bits |= bit
+        else:
+            self.empty |= bit
+        self.index += (SYMBOL_VALUE[symbol] - SYMBOL_VALUE[old]) * geometry.pow3[i]
+
+        states = self.line_states
+        if states is not None:
+            change = SYMBOL_VALUE[symbol] - SYMBOL_VALUE[old]
+            for line, digit in geometry.line_digits[i]:
+                states[line] += change * digit
+
+        # only the lines through this square can have been broken or completed
+        if geometry is CLASSIC:
+            return  # check_win looks the whole 3x3 board up in WIN_TABLE instead
+        if old != ' ' and self.wins:
+            self.wins -= geometry.lines_completed(self.x_bits | bit if old == 'X' else self.o_bits | bit, i)
+        if symbol != ' ':
+            self.wins += geometry.lines_completed(self.x_bits if symbol == 'X' else self.o_bits, i)
+
+
+#-------------------------------- Graphics ----------------------
+# pygame is only imported once something is actually drawn, so batch runs and
+# worker processes never pay for it.  There is one window for all the games,
+# and it belongs to its own process: that process handles the window's events
+# and redraws at GRAPHICS_FPS from the board the games last handed over in
+# shared memory.  The games never wait for the window, and the window keeps
+# responding while a long search (deepen, MCTS) is thinking.
+pygame = None
+
+def load_pygame():
+    global pygame
+    if pygame is None:
+        import pygame as module
+        pygame = module
+    return pygame
+
+# The window process.  board is a shared array of the current board's symbols,
+# closed is set when the window gets closed.  A frame can catch a board halfway
+# through being written; the next frame puts it right.
+def _render_loop(board, closed, fps):
+    load_pygame()
+    pygame.init()
+    screen = pygame.display.set_mode((300, 300))
+    pygame.display.set_caption("Tic Tac Toe")
+    font = pygame.font.Font(None, 36)
+    clock = pygame.time.Clock()
+    while True:
+        # Process events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                closed.value = True
+                pygame.quit()
+                return
+        draw_board(screen, font, board.raw.decode())
+        pygame.display.flip()  # Update the display after drawing
+        clock.tick(fps)
+
+def draw_board(screen, font, board):
+    # Clear screen
+    screen.fill((255, 0, 0))
+    # print("drawing graphical board")
+
+    win_text = font.render("hello", True, (255, 0, 0))  # Red text
+    text_rect = win_text.get_rect(center=(100, 150))  # Center the text
+    screen.blit(win_text, text_rect)
+
+    # Draw lines
+    size = int(len(board) ** 0.5)
+    cell = 300 // size
+    for line in range(1, size):
+        pygame.draw.line(screen, (0, 0, 0), (line * cell, 0), (line * cell, 300), 2)
+        pygame.draw.line(screen, (0, 0, 0), (0, line * cell), (300, line * cell), 2)
+
+    # Draw symbols
+    for i in range(len(board)):
+        symbol = board[i]
+        if symbol != ' ':
+            text = font.render(symbol, True, (0, 0, 0))
+            screen.blit(text, (i % size * cell + cell * 35 // 100, i // size * cell + cell * 35 // 100))
+
+class BoardRenderer:
+    def __init__(self, fps=GRAPHICS_FPS, every=GRAPHICS_EVERY):
+        self.fps = fps
+        self.every = every
+        self.games = 0
+        self.board = None  # shared array the window process draws from
+        self.closed = None
+        self.process = None  # window process, started on the first show()
+
+    # Called once per game, True if this game should be drawn
+    def start_game(self):
+        self.games += 1
+        return (self.games - 1) % self.every == 0
+
+    # Hand the board over to the window process - never waits
+    def show(self, board):
+        if self.process is None:
+            self.open_window(len(board))
+        if self.closed.value:  # window closed, stop like before
+            sys.exit()
+        self.board.raw = ''.join(board).encode()
+
+    # Give the window process a frame to draw the last board, e.g. once all the games are done
+    def flush(self):
+        if self.process is not None:
+            time.sleep(2 / self.fps)
+
+    def open_window(self, squares):
+        self.board = multiprocessing.RawArray('c', b' ' * squares)
+        self.closed = multiprocessing.RawValue('b', False)
+        self.process = multiprocessing.Process(target=_render_loop, args=(self.board, self.closed, self.fps), daemon=True)
+        self.process.start()
+
+_renderer = None
+
+# The shared renderer, made on first use
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = BoardRenderer()
+    return _renderer
+
+
 class TicTacToe:
-    def __init__(self, player1, player2):
-        self.board = [' ' for _ in range(9)]
+    def __init__(self, player1, player2, size=None, win_length=None):
+        size = size or BOARD_SIZE
+        self.board = BitBoard(geometry=board_geometry(size, win_length or min(WIN_LENGTH, size)))
         self.players = [player1, player2]
         #self.display_board()  # Display the board initially
 
-        # For graphical display
-        if DRAW_GRAPHICS:
-            pygame.init()
-            self.screen = pygame.display.set_mode((300, 300))
-            pygame.display.set_caption("Tic Tac Toe")
-            self.font = pygame.font.Font(None, 36)
-            self.clock = pygame.time.Clock()
+        self.moves = []  # squares played so far, in order - push and pop add and take back the last one
+
+        # For graphical display - None if this game isn't drawn
+        self.renderer = None
+        if DRAW_GRAPHICS and get_renderer().start_game():
+            self.renderer = get_renderer()
 
     def play(self):
          while True:
 
-            if DRAW_GRAPHICS:
-                # Process events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-
             for player in self.players:
                 self.display_board()
                 self.display_graphical_board()
+                empty, played = self.board.empty, len(self.moves)
                 player.make_move(self)
-                if self.check_win(game.board):
+                # the one new square is the move, unless it was pushed (strategies may use make_move for trial moves too)
+                if len(self.moves) == played:
+                    self.moves.append((empty ^ self.board.empty).bit_length() - 1)
+                if self.check_win(self.board):
                     self.display_board()
                     self.display_graphical_board()
                     print_on(f"                    {player.symbol} wins!")
@@ -114,24 +443,51 @@ class TicTacToe:
                     return ('tie')  #tie
 
     def is_valid_move(self, move):
-        return self.board[move] == ' ' and 0 <= move <= 8
+        return self.board[move] == ' ' and 0 <= move < len(self.board)
 
     def make_move(self, move, symbol):
         self.board[move] = symbol
 
-    def check_win(self, theBoard):
-        win_conditions = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-            [0, 4, 8], [2, 4, 6]  # Diagonals
-        ]
+    # Trial moves for searches: push plays a move (for the side to move unless
+    # symbol says otherwise) and adds it to self.moves, pop takes the last one
+    # back.  The board keeps a mask of its empty squares as it goes, so
+    # legal_moves and to_move never scan it.
+    def push(self, move, symbol=None):
+        self.board[move] = symbol or self.players[self.board.filled & 1].symbol
+        self.moves.append(move)
+
+    def pop(self):
+        move = self.moves.pop()
+        self.board[move] = ' '
+        return move
 
-        debug_print_on(f"Current board state: {theBoard} (length: {len(theBoard)})")
+    # The empty squares, lowest first
+    def legal_moves(self):
+        return self.board.empty_squares()
 
-        # Ensure the board is exactly 9 elements long
-        if len(theBoard) != 9:
-            raise ValueError("Board should have exactly 9 positions.")
-        return any(all(theBoard[i] == symbol for i in combo) for symbol in ['X', 'O'] for combo in win_conditions)
+    # Symbol of the side to move - player 1 moves first
+    def to_move(self):
+        return self.players[self.board.filled & 1].symbol
+
+    def check_win(self, theBoard):
+        if DEBUG_PRINT_ON:  # skip building the f-string on every search node
+            debug_print_on(f"Current board state: {theBoard} (length: {len(theBoard)})")
+
+        # Fast path - the game's own board already carries its masks / win count
+        if type(theBoard) is BitBoard:
+            if theBoard.geometry is CLASSIC:
+                return WIN_TABLE[theBoard.x_bits] or WIN_TABLE[theBoard.o_bits]
+            return theBoard.wins > 0
+
+        # Ensure the board is the same size as this game's board
+        geometry = self.board.geometry
+        if len(theBoard) != geometry.squares:
+            raise ValueError(f"Board should have exactly {geometry.squares} positions.")
+        x_bits, o_bits = board_masks(theBoard)
+        for line_mask in geometry.line_masks:
+            if x_bits & line_mask == line_mask or o_bits & line_mask == line_mask:
+                return True
+        return False
     
     def check_win2(self, theBoard):
         win_conditions = [
@@ -154,41 +510,22 @@ class TicTacToe:
 
 
     def is_board_full(self):
-        return ' ' not in self.board
+        return not self.board.empty
 
     def display_board(self):
         #print("\nCurrent Board State:")
-        for i in range(0, 9, 3):
-            print_on(f" {self.board[i]} | {self.board[i+1]} | {self.board[i+2]} ")
-            if i < 6:
-                print_on("-----------")
+        size = self.board.geometry.size
+        for i in range(0, len(self.board), size):
+            print_on(" " + " | ".join(self.board[i:i+size]) + " ")
+            if i < len(self.board) - size:
+                print_on("-" * (4 * size - 1))
         print_on ("")
         print_on("")
 
+    # Hands the board to the renderer's window process
     def display_graphical_board(self):
-     if DRAW_GRAPHICS:
-        # Clear screen
-        self.screen.fill((255, 0, 0))
-        # print("drawing graphical board")
-        
-        win_text = self.font.render("hello", True, (255, 0, 0))  # Red text
-        text_rect = win_text.get_rect(center=(100, 150))  # Center the text
-        self.screen.blit(win_text, text_rect)
-
-        # Draw lines
-        for line in range(1, 3):
-            pygame.draw.line(self.screen, (0, 0, 0), (line * 100, 0), (line * 100, 300), 2)
-            pygame.draw.line(self.screen, (0, 0, 0), (0, line * 100), (300, line * 100), 2)
-        
-        # Draw symbols
-        for i in range(9):
-            symbol = self.board[i]
-            if symbol != ' ':
-                text = self.font.render(symbol, True, (0, 0, 0))
-                self.screen.blit(text, (i % 3 * 100 + 35, i // 3 * 100 + 35))
-
-        pygame.display.flip()  # Update the display after drawing
-        time.sleep(0.5)
+        if self.renderer is not None:
+            self.renderer.show(self.board)
 
      #Helper function for JudahsCoolAI
     def make_temporary_move(self, move, symbol):
@@ -206,24 +543,19 @@ class TicTacToe:
         self.board[move] = original_symbol  # reset it back to its original state
         return is_winning
         
-    #Helper function for Judah, Noah
+    #Helper function for Judah, Noah - index of the player to move (0 = player 1)
     def checkPlayer(self):
-        availableMoves = []
-        for i in range(9):
-            if self.is_valid_move(i):
-                availableMoves.append(i)
-        if (len(availableMoves)%2 == 0):
-            return 1
-        else:
-            return 0
+        return self.board.filled & 1
 
         
 
 # Example of a simple AI strategy - pick FIRST available space 0 - 8
 class SimpleAI:
+    deterministic = True
+
     def determine_move(self, game):
         # Simple strategy: check for winning move, then blocking opponent's win, then take first open space
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 game.board[i] = 'X'  # Assuming this AI plays 'X'
                 if game.check_win(game.board):
@@ -231,7 +563,7 @@ class SimpleAI:
                     debug_print_on ("     GOING FOR WIN")
                     return i
                 game.board[i] = ' '  # Reset for next check
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 game.board[i] = 'O'  # Check if opponent ('O') could win
                 if game.check_win(game.board):
@@ -240,7 +572,7 @@ class SimpleAI:
                     return i
                 game.board[i] = ' '  # Reset for next check
         # If no immediate winning or blocking move, take first available space
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 return i
             
@@ -249,7 +581,7 @@ class RandomAI:
     def determine_move(self, game):
         possibleMoves = []
         #add all open spaces into a list to then randomly choose one
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 possibleMoves.append(i)
         return (random.choice(possibleMoves))
@@ -258,12 +590,12 @@ class AaronMikeAI:
     def determine_move(self, game):
         possibleMoves = []
         #add all open spaces into a list to then randomly choose one
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 possibleMoves.append(i)
         
         #check if we have winning move
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 game.board[i] = 'O'  # Assuming this AI plays 'O'
                 if game.check_win(game.board):
@@ -272,7 +604,7 @@ class AaronMikeAI:
                 game.board[i] = ' '  # Reset for next check
 
         #check if enemy has winning move
-        for i in range(9):
+        for i in range(len(game.board)):
             if game.is_valid_move(i):
                 game.board[i] = 'X'  # Check if opponent ('X') could win
                 if game.check_win(game.board):
@@ -302,7 +634,7 @@ class JudahsCoolAI:
 
         #This'll check for a winning move for both the AI and the opponent and also where you call the lambda
         for symbol in ('O', 'X'):  
-            for move in range(9):
+            for move in range(len(game.board)):
                 if is_winning_move(symbol, move):
                     return move
 
@@ -312,15 +644,17 @@ class JudahsCoolAI:
             return random.choice(corners)
 
         # Pick a random available spot if there's no moves
-        possible_moves = [i for i in range(9) if game.is_valid_move(i)]
+        possible_moves = [i for i in range(len(game.board)) if game.is_valid_move(i)]
         return random.choice(possible_moves)
 
 # Plays based off of the order of the numbers in pi
 class DavidAI:     
+    deterministic = True
+
     def determine_move(self, game):
         #print(game.players[1].symbol) - exmample to access symbols from here
         empty = []
-        for z in range(9):
+        for z in range(len(game.board)):
             if game.is_valid_move(z):
                 empty.append(z+1)
                 
@@ -357,7 +691,9 @@ class DavidAI:
         for z in range(len(empty)):
             if empty[z] == 7:
                 return 6
-            
+        #Bigger boards - pi has run out of squares, take the first open one
+        return empty[0] - 1
+
 # this AI makes a list of possible moves, then preferred moves, then picks a random preferred
 # move. It has no block function because there were too many bugs.
 class Felix_Jessie_AI:
@@ -369,11 +705,11 @@ class Felix_Jessie_AI:
            p1 = False
        return p1
    def determine_move(self, game):  
-        rows = 3 #this will change depending on the amount of rows in a board
+        rows = int(len(game.board) ** 0.5) #this will change depending on the amount of rows in a board
         possibleMoves = []
         moves = []
         #look for a possible win (works by subbing in "O" and using the check_win)
-        for spot in range (0,9):
+        for spot in range(0, len(game.board)):
             if game.is_valid_move(spot):
                 game.board[spot] = "O"
                 win = game.check_win(game.board) #check win returns true or false using any(), which checks for true items in a list
@@ -384,7 +720,7 @@ class Felix_Jessie_AI:
                     return win_spot
                 game.board[spot] = ' '
         #look for a possible spot (works the same as the previous check but for the opposite purpose)
-        for spot in range(0,9):
+        for spot in range(0, len(game.board)):
             if game.is_valid_move(spot):
                 game.board[spot] = "X"
                 lose = game.check_win(game.board)
@@ -454,149 +790,953 @@ class Felix_Jessie_AI:
 
 
 
+#-------------------------------- Search statistics ----------------------
+# Counters a search can report into: nodes per depth (0 = the position right
+# after the move being considered, like MinimaxAI.minimax), leaves that ended the game
+# vs. leaves that were scored by an evaluation, check_win calls, cutoffs and a
+# histogram of how long each move took.  Everything is a fixed-size counter, so
+# it costs the same on the opening move as at the end of the game.  With
+# trace_path set, every trace_every-th node is also written to that file as
+# "depth<tab>board".
+#
+# A strategy opts in by having a stats attribute (None = off, which is one
+# "is not None" test per node): MinimaxAI_stats always keeps one, MinimaxAI
+# takes stats=, and strategies using the alpha-beta engine can be given one
+# with attach_stats().  AIPlayer times determine_move for any strategy whose
+# stats isn't None.
+MOVE_TIME_BUCKETS = [0.001, 0.01, 0.1, 1, 10]  # seconds - histogram upper edges, plus one for slower moves
+
+class SearchStats:
+    def __init__(self, trace_path=None, trace_every=1000):
+        self.trace_path = trace_path
+        self.trace_every = trace_every
+        self.trace = None  # file, opened on the first sampled node
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0
+        self.nodes_by_depth = [0] * 10  # grows if a search goes deeper
+        self.terminal_leaves = 0  # win or full board
+        self.evaluated_leaves = 0  # out of depth, scored by an evaluation
+        self.check_win_calls = 0
+        self.cutoffs = 0
+        self.moves = 0
+        self.move_time = 0.0
+        self.slowest_move = 0.0
+        self.move_times = [0] * (len(MOVE_TIME_BUCKETS) + 1)
+
+    # The trace file can't go to other processes, each one opens its own
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['trace'] = None
+        return state
+
+    def node(self, depth, board=None):
+        self.nodes += 1
+        if depth >= len(self.nodes_by_depth):
+            self.nodes_by_depth.extend([0] * (depth + 1 - len(self.nodes_by_depth)))
+        self.nodes_by_depth[depth] += 1
+        if self.trace_path is not None and board is not None and self.nodes % self.trace_every == 0:
+            if self.trace is None:
+                self.trace = open(self.trace_path, 'a')
+            self.trace.write(f"{depth}\t{''.join(board)}\n")
+
+    def leaf(self, terminal):
+        if terminal:
+            self.terminal_leaves += 1
+        else:
+            self.evaluated_leaves += 1
+
+    def record_move(self, seconds):
+        self.moves += 1
+        self.move_time += seconds
+        self.slowest_move = max(self.slowest_move, seconds)
+        bucket = 0
+        while bucket < len(MOVE_TIME_BUCKETS) and seconds >= MOVE_TIME_BUCKETS[bucket]:
+            bucket += 1
+        self.move_times[bucket] += 1
+
+    def close(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+
+    def report(self):
+        while len(self.nodes_by_depth) > 1 and self.nodes_by_depth[-1] == 0:
+            self.nodes_by_depth.pop()
+        lines = [f"Nodes: {self.nodes}  by depth: {self.nodes_by_depth}",
+                 f"Leaves: {self.terminal_leaves} game over, {self.evaluated_leaves} evaluated",
+                 f"check_win calls: {self.check_win_calls}  cutoffs: {self.cutoffs}"]
+        if self.moves:
+            labels = [f"<{edge * 1000:g}ms" for edge in MOVE_TIME_BUCKETS] + [f">={MOVE_TIME_BUCKETS[-1] * 1000:g}ms"]
+            histogram = "  ".join(f"{label}: {count}" for label, count in zip(labels, self.move_times) if count)
+            lines.append(f"Moves: {self.moves}  avg {self.move_time / self.moves * 1000:.2f} ms"
+                         f"  slowest {self.slowest_move * 1000:.2f} ms  ({histogram})")
+        return "\n".join(lines)
+
+# Give a strategy (and its alpha-beta engine, if it has one) a SearchStats
+def attach_stats(strategy, stats=None):
+    stats = stats if stats is not None else SearchStats()
+    strategy.stats = stats
+    if getattr(strategy, 'engine', None) is not None:
+        strategy.engine.stats = stats
+    return stats
+
+
+#-------------------------------- Transposition table ----------------------
+# Minimax strategies can opt into a TranspositionTable to remember the value of
+# positions they have already searched.  Positions are keyed by their canonical
+# form: the smallest base-3 index over the 8 rotations/reflections of the board,
+# so mirrored positions and different move orders share one entry.  That is only
+# correct for evaluations that don't care about orientation, and every entry is
+# from the point of view of the strategy that stored it - use one table per
+# strategy instance.  Depth-limited searches only reuse entries searched to the
+# same depth (or deep enough to reach the end of the game), so moves never change.
+
+# D4_PERMUTATIONS[t][i] = the square that moves to square i under transform t
+def _d4_permutations(size=3):
+    last = size - 1
+    transforms = [
+        lambda r, c: (r, c), lambda r, c: (c, last - r), lambda r, c: (last - r, last - c), lambda r, c: (last - c, r),  # rotations
+        lambda r, c: (r, last - c), lambda r, c: (last - r, c), lambda r, c: (c, r), lambda r, c: (last - c, last - r)   # reflections
+    ]
+    perms = []
+    for transform in transforms:
+        perm = [0] * (size * size)
+        for square in range(size * size):
+            r, c = transform(square // size, square % size)
+            perm[r * size + c] = square
+        perms.append(perm)
+    return perms
+
+D4_PERMUTATIONS = _d4_permutations()
+_canonical_table = None
+
+# Canonical (symmetry-reduced) form of a base-3 board index
+def canonical_index(index):
+    global _canonical_table
+    if _canonical_table is None:  # built once, on first use
+        table = array('H', bytes(2 * 3 ** 9))
+        for i in range(3 ** 9):
+            digits = [i // POW3[square] % 3 for square in range(9)]
+            table[i] = min(sum(digits[perm[square]] * POW3[square] for square in range(9)) for perm in D4_PERMUTATIONS)
+        _canonical_table = table
+    return _canonical_table[index]
+
+class TranspositionTable:
+    # bound types
+    EXACT = 0
+    LOWER = 1  # real value is >= stored value
+    UPPER = 2  # real value is <= stored value
+
+    FULL_DEPTH = 99  # depth stored by searches that always go to the end of the game
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (value, bound, depth), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # tag separates positions that search differently, e.g. whose turn it is.
+    # depth is how many more plies the search may look ahead from this position.
+    # Boards other than 3x3 aren't symmetry-reduced, they're keyed by their masks.
+    def key(self, board, tag=0, depth=FULL_DEPTH):
+        if type(board) is BitBoard:
+            x_bits, o_bits = board.x_bits, board.o_bits
+        else:
+            x_bits, o_bits = board_masks(board)
+        depth = max(0, min(depth, len(board) - bin(x_bits | o_bits).count('1')))  # looking past the end changes nothing
+        if len(board) != 9:
+            return (x_bits, o_bits, int(tag), depth)
+        index = board.index if type(board) is BitBoard else board_index(board)
+        return (canonical_index(index) * 4 + int(tag)) * 10 + depth
+
+    # Returns (value, bound, depth) or None
+    def probe(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    # Least recently used entries are evicted once the table is full
+    def store(self, key, value, bound, depth):
+        self.entries[key] = (value, bound, depth)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+#-------------------------------- Shared transposition table ----------------------
+# A TranspositionTable in shared memory, so the worker processes of a tournament
+# reuse each other's search results instead of all working out the same ones.
+# It's a fixed number of slots and each slot holds one entry packed into three
+# 64-bit words:
+#   check: key ^ value ^ info
+#   value: the score as a double
+#   info:  depth | bound << 8 | used/int flags | pid of the process that wrote it << 32
+# There are no locks.  Two processes writing the same slot at the same time can
+# leave it torn, but then check doesn't match any more and the slot just reads as
+# a miss (the lockless hashing trick from chess programs).  A new entry always
+# replaces whatever was in its slot.
+#
+# Hits and misses are counted by each process, along with how many of the hits
+# were entries another process wrote.
+SHARED_TT_SLOT = struct.Struct('<QQQ')
+SHARED_TT_SLOTS = 1 << 18  # 6 MB
+SHARED_TT_USED = 1 << 16
+SHARED_TT_INT = 1 << 17  # value was an int, give it back as one
+MASK64 = (1 << 64) - 1
+F64 = struct.Struct('<d')
+U64 = struct.Struct('<Q')
+
+class SharedTranspositionTable(TranspositionTable):
+    # name=None makes a new table, otherwise it attaches to the one with that name.
+    # Strategies that score positions differently need different namespaces.
+    def __init__(self, slots=SHARED_TT_SLOTS, name=None, namespace=''):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * SHARED_TT_SLOT.size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = name is None
+        self.slots = 1 << (len(self.shm.buf) // SHARED_TT_SLOT.size).bit_length() - 1  # power of two
+        self.max_entries = self.slots
+        self.shift = 64 - (self.slots.bit_length() - 1)
+        self.namespace = namespace
+        self.salt = int.from_bytes(hashlib.blake2b(namespace.encode(), digest_size=8).digest(), 'little')
+        self.pid = os.getpid()
+        self.reset_stats()
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    # Same positions as TranspositionTable.key, mixed into 64 bits.  The top bits pick the slot.
+    # Bigger boards are keyed by a tuple of ints, and those hash the same in every process.
+    def key(self, board, tag=0, depth=TranspositionTable.FULL_DEPTH):
+        key = super().key(board, tag, depth)
+        if type(key) is not int:
+            key = hash(key)
+        return ((key ^ self.salt) * 0x9E3779B97F4A7C15) & MASK64
+
+    def probe(self, key):
+        check, value_bits, info = SHARED_TT_SLOT.unpack_from(self.shm.buf, (key >> self.shift) * SHARED_TT_SLOT.size)
+        if check ^ value_bits ^ info != key or not info & SHARED_TT_USED:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if info >> 32 != self.pid:
+            self.shared_hits += 1
+        value = F64.unpack(U64.pack(value_bits))[0]
+        if info & SHARED_TT_INT:
+            value = int(value)
+        return value, info >> 8 & 0xFF, info & 0xFF
+
+    def store(self, key, value, bound, depth):
+        info = self.pid << 32 | SHARED_TT_USED | bound << 8 | min(depth, 0xFF)
+        if type(value) is int:
+            info |= SHARED_TT_INT
+        value_bits = U64.unpack(F64.pack(value))[0]
+        SHARED_TT_SLOT.pack_into(self.shm.buf, (key >> self.shift) * SHARED_TT_SLOT.size, key ^ value_bits ^ info, value_bits, info)
+        self.stores += 1
+
+    # Empties the table for every process and namespace
+    def clear(self):
+        self.shm.buf[:] = bytes(len(self.shm.buf))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'slots': self.slots, 'hits': self.hits, 'misses': self.misses, 'stores': self.stores,
+                'shared_hits': self.shared_hits, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.shared_hits = 0
+
+    # The process that made the table also removes it
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+# Shared table the STRATEGIES entries in this process use, see attach_shared_tt
+_worker_tt_name = None
+_worker_tts = {}  # namespace -> SharedTranspositionTable
+
+# Pool initializer: from now on strategy_tt hands out views of the shared table
+# with this name (None goes back to a private table per strategy)
+def attach_shared_tt(name):
+    global _worker_tt_name
+    for tt in _worker_tts.values():
+        tt.shm.close()
+    _worker_tts.clear()
+    _worker_tt_name = name
+
+# Transposition table for a STRATEGIES entry.  Each strategy and symbol gets its
+# own namespace in the shared table, the same one in every process.
+def strategy_tt(strategy, symbol):
+    if _worker_tt_name is None:
+        return TranspositionTable()
+    namespace = f"{strategy}/{symbol}"
+    if namespace not in _worker_tts:
+        _worker_tts[namespace] = SharedTranspositionTable(name=_worker_tt_name, namespace=namespace)
+    return _worker_tts[namespace]
+
+# (pid, counts) for everything this process looked up in the shared table, or None
+def worker_tt_stats():
+    if _worker_tt_name is None:
+        return None
+    counts = {field: sum(tt.stats()[field] for tt in _worker_tts.values()) for field in ('hits', 'misses', 'stores', 'shared_hits')}
+    return os.getpid(), counts
+
+
+#-------------------------------- Alpha-beta engine ----------------------
+# Shared alpha-beta search that the minimax classes can hand their search to.
+# Moves are tried immediate wins first, then blocks, then center, corners and
+# edges, which makes cutoffs come early.  The engine only needs to know which
+# symbol each side plays, what a win is worth and how to score a position when
+# it runs out of depth, so every class keeps its own scoring.
+#
+# At the root, moves are searched with a window that only asks "is this better
+# than (or as good as) the best so far", and ties go to the lowest square - the
+# same move the plain loops over range(9) pick.  Scores must be whole numbers
+# (or +/- infinity) for that tie test to work.
+#
+# deepen() is the anytime version: it searches 0, 1, 2 ... plies past the root
+# move until the depth limit or a wall-clock budget runs out and returns the
+# deepest search that finished.  A search still running at the deadline is
+# abandoned, so a move never takes much longer than the budget.
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]  # center, corners, edges (3x3)
+DEADLINE_CHECK = 31  # look at the clock every 32 nodes
+
+# Raised inside the engine when the deadline passes, caught by deepen()
+class SearchTimeout(Exception):
+    pass
+
+class AlphaBetaEngine:
+    def __init__(self, max_symbol, min_symbol, win_score=1, horizon=None, tt=None):
+        self.max_symbol = max_symbol  # symbol placed by the maximizing side
+        self.min_symbol = min_symbol
+        self.win_score = win_score  # score when the maximizing side has just won
+        self.horizon = horizon  # horizon(game, maximizing) -> score when out of depth
+        self.tt = tt  # optional TranspositionTable
+        self.nodes = 0
+        self.cutoffs = 0
+        self.deadline = None  # perf_counter() time to give up at, set by deepen()
+        self.history = None  # per-square cutoff counts, only kept while deepening
+        self.depth_reached = None  # deepest finished iteration of the last deepen()
+        self.stats = None  # optional SearchStats
+        self.root_depth = 0  # depth of the current search, to turn depth left into depth from the root move
+
+    # Immediate wins, then blocks, then center/corners/edges
+    def ordered_moves(self, board, maximizing):
+        symbol = self.max_symbol if maximizing else self.min_symbol
+        mine, theirs = (board.x_bits, board.o_bits) if symbol == 'X' else (board.o_bits, board.x_bits)
+        filled = mine | theirs
+        wins = []
+        blocks = []
+        quiet = []
+        geometry = board.geometry
+        if geometry is CLASSIC:
+            for move in MOVE_ORDER:
+                if filled & BIT[move]:
+                    continue
+                if WIN_TABLE[mine | BIT[move]]:
+                    wins.append(move)
+                elif WIN_TABLE[theirs | BIT[move]]:
+                    blocks.append(move)
+                else:
+                    quiet.append(move)
+        else:
+            # bigger boards: only the lines through the move can be completed by it
+            for move in geometry.move_order:
+                bit = 1 << move
+                if filled & bit:
+                    continue
+                if geometry.completes(mine | bit, move):
+                    wins.append(move)
+                elif geometry.completes(theirs | bit, move):
+                    blocks.append(move)
+                else:
+                    quiet.append(move)
+        if self.history is not None:  # moves that caused cutoffs in earlier iterations first
+            quiet.sort(key=self.history.__getitem__, reverse=True)
+        return wins + blocks + quiet
+
+    # Search every root move and return (best_score, best_moves).
+    # depth is how many plies may still be played after the root move.
+    # ties='first' returns only the lowest best square, ties='all' every best square.
+    # order overrides the order the root moves are tried in.
+    def search(self, game, maximizing, depth=TranspositionTable.FULL_DEPTH, ties='first', order=None):
+        self.nodes = 0
+        self.cutoffs = 0
+        symbol = self.max_symbol if maximizing else self.min_symbol
+        best_score = None
+        best_moves = []
+        self.root_depth = depth
+
+        for move in order if order is not None else self.ordered_moves(game.board, maximizing):
+            # a tie only counts for a lower square (or when collecting every best move)
+            tie_counts = ties == 'all' or (best_moves and move < best_moves[0])
+            alpha, beta = -float('inf'), float('inf')
+            if best_score is not None:
+                if maximizing:
+                    alpha = _score_below(best_score) if tie_counts else best_score
+                else:
+                    beta = _score_above(best_score) if tie_counts else best_score
+
+            game.board[move] = symbol
+            score = self.value(game, not maximizing, depth, alpha, beta)
+            game.board[move] = ' '
+
+            if best_score is None or (score > best_score if maximizing else score < best_score):
+                best_score, best_moves = score, [move]
+            elif score == best_score and tie_counts:
+                best_moves = [move] if ties == 'first' else best_moves + [move]
+
+        return best_score, sorted(best_moves)
+
+    # Iterative deepening under a time budget (seconds, None = no limit).
+    # Returns (best_score, best_moves) like search(); best_score is None if not
+    # even the 0-ply search finished, and best_moves is then the first move in
+    # the usual order (a win or block if there is one).  Each iteration tries
+    # the previous best moves first, and quiet moves that caused cutoffs in
+    # earlier iterations are tried before the others.
+    def deepen(self, game, maximizing, max_depth=TranspositionTable.FULL_DEPTH, time_budget=None, ties='first'):
+        start = time.perf_counter()
+        self.deadline = start + time_budget if time_budget is not None else None
+        self.history = [0] * len(game.board)
+        self.depth_reached = None
+        saved = game.board[:]
+        order = self.ordered_moves(game.board, maximizing)
+        last_depth = int(min(max_depth, game.board.count(' ') - 1))  # looking past the end changes nothing
+        result = (None, order[:1])
+        total_nodes = 0
+        try:
+            for depth in range(last_depth + 1):
+                try:
+                    result = self.search(game, maximizing, depth, ties, order)
+                except SearchTimeout:
+                    game.board[:] = saved  # the abandoned search left its moves on the board
+                    break
+                finally:
+                    total_nodes += self.nodes
+                self.depth_reached = depth
+                order = result[1] + [move for move in order if move not in result[1]]
+        finally:
+            self.deadline = None
+            self.history = None
+        self.nodes = total_nodes
+        return result
+
+    def value(self, game, maximizing, depth, alpha, beta):
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & DEADLINE_CHECK and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        board = game.board
+        stats = self.stats
+        if stats is not None:
+            stats.node(self.root_depth - depth, board)
+            stats.check_win_calls += 1
+
+        if game.check_win(board):
+            if stats is not None:
+                stats.leaf(True)
+            return -self.win_score if maximizing else self.win_score  # the side that just moved won
+        if game.is_board_full():
+            if stats is not None:
+                stats.leaf(True)
+            return 0
+        if depth <= 0:
+            if stats is not None:
+                stats.leaf(False)
+            return self.horizon(game, maximizing)
+
+        tt_key = None
+        if self.tt is not None:
+            tt_key = self.tt.key(board, maximizing, depth)
+            entry = self.tt.probe(tt_key)
+            if entry is not None:
+                value, bound, _ = entry
+                if bound == TranspositionTable.EXACT:
+                    return value
+                if bound == TranspositionTable.LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        alpha_orig, beta_orig = alpha, beta
+
+        if maximizing:
+            best = -float('inf')
+            for move in self.ordered_moves(board, True):
+                board[move] = self.max_symbol
+                score = self.value(game, False, depth - 1, alpha, beta)
+                board[move] = ' '
+                if score > best:
+                    best = score
+                    if best > alpha:
+                        alpha = best
+                        if alpha >= beta:
+                            self.cutoffs += 1
+                            if stats is not None:
+                                stats.cutoffs += 1
+                            if self.history is not None:
+                                self.history[move] += depth * depth
+                            break
+        else:
+            best = float('inf')
+            for move in self.ordered_moves(board, False):
+                board[move] = self.min_symbol
+                score = self.value(game, True, depth - 1, alpha, beta)
+                board[move] = ' '
+                if score < best:
+                    best = score
+                    if best < beta:
+                        beta = best
+                        if alpha >= beta:
+                            self.cutoffs += 1
+                            if stats is not None:
+                                stats.cutoffs += 1
+                            if self.history is not None:
+                                self.history[move] += depth * depth
+                            break
+
+        if tt_key is not None:
+            if best <= alpha_orig:
+                bound = TranspositionTable.UPPER
+            elif best >= beta_orig:
+                bound = TranspositionTable.LOWER
+            else:
+                bound = TranspositionTable.EXACT
+            self.tt.store(tt_key, best, bound, depth)
+        return best
+
+# Next whole-number score below/above, used for the root tie windows
+def _score_below(score):
+    if score == float('inf'):
+        return sys.float_info.max
+    return score - 1
+
+def _score_above(score):
+    if score == -float('inf'):
+        return -sys.float_info.max
+    return score + 1
+
+
+#-------------------------------- Evaluation tables ----------------------
+# A heuristic is described by what it scores instead of code that walks the
+# board at every node:
+#   line(cells)        score of one win_length line.  cells is a string with
+#                      'M' for our mark, 'T' for theirs and ' ' for empty, so on
+#                      the 3x3 board it's called once for each of the 27 patterns
+#   squares(geometry)  weight of owning each square (the opponent's count against us)
+#   groups             [group(geometry) -> (squares, score(cells)), ...] for rules
+#                      about particular squares, like "the center and a corner"
+#   late_line, late_groups   added once late_empty or fewer squares are empty
+# The functions only run while compiling the tables for a board size and side.
+# On boards of up to 9 squares the tables are then summed for every position
+# ahead of time, so an evaluation is one lookup by board.index.  Bigger boards
+# keep their line pattern numbers (BitBoard.track_lines) and an evaluation is
+# one lookup per line plus one per group and a popcount per ownership weight.
+POSITION_TABLE_SQUARES = 9  # boards this small get one table over all 3**squares positions
+
+class Heuristic:
+    def __init__(self, line=None, squares=None, groups=(), late_empty=None, late_line=None, late_groups=()):
+        self.line = line
+        self.squares = squares
+        self.groups = list(groups)
+        self.late_empty = late_empty
+        self.late_line = late_line
+        self.late_groups = list(late_groups)
+        self.compiled = {}  # (geometry, symbol) -> CompiledHeuristic
+
+    # The tables are rebuilt where they're used rather than sent to other processes
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['compiled'] = {}
+        return state
+
+    def compile(self, geometry, symbol):
+        compiled = self.compiled.get((geometry, symbol))
+        if compiled is None:
+            compiled = self.compiled[(geometry, symbol)] = CompiledHeuristic(self, geometry, symbol)
+        return compiled
+
+    # Score of the board (a BitBoard) for symbol
+    def score(self, board, symbol):
+        compiled = self.compiled.get((board.geometry, symbol))
+        if compiled is None:
+            compiled = self.compile(board.geometry, symbol)
+        return compiled.score(board)
+
+# The cells string (see Heuristic) for base-3 digits
+def pattern_cells(digits, symbol):
+    mine = SYMBOL_VALUE[symbol]
+    return ''.join(' ' if digit == 0 else 'M' if digit == mine else 'T' for digit in digits)
+
+class CompiledHeuristic:
+    def __init__(self, heuristic, geometry, symbol):
+        self.geometry = geometry
+        self.mine_is_x = symbol == 'X'
+        k = geometry.win_length
+
+        # line tables are indexed by the line's pattern number
+        patterns = [pattern_cells([state // 3 ** place % 3 for place in range(k)], symbol) for state in range(3 ** k)]
+        self.line_table = [heuristic.line(cells) for cells in patterns] if heuristic.line else None
+        self.late_line_table = [heuristic.late_line(cells) for cells in patterns] if heuristic.late_line else None
+
+        # one (weight, mask of the squares with that weight) per weight
+        self.ownership = []
+        if heuristic.squares:
+            weights = heuristic.squares(geometry)
+            for weight in sorted(set(weights)):
+                if weight:
+                    self.ownership.append((weight, sum(1 << square for square in range(geometry.squares)
+                                                       if weights[square] == weight)))
+
+        self.groups = [self.compile_group(group, symbol) for group in heuristic.groups]
+        self.late_groups = [self.compile_group(group, symbol) for group in heuristic.late_groups]
+        self.late_empty = heuristic.late_empty if self.late_line_table or self.late_groups else None
+
+        self.table = None
+        if geometry.squares <= POSITION_TABLE_SQUARES:
+            self.table = self.position_table()
+
+    # (mask, {X bits | O bits << squares: score}) - only the scores that aren't 0 are kept
+    def compile_group(self, group, symbol):
+        squares, score = group(self.geometry)
+        distinct = sorted(set(squares))
+        table = {}
+        for digits in itertools.product(range(3), repeat=len(distinct)):
+            value = dict(zip(distinct, digits))
+            weight = score(pattern_cells([value[square] for square in squares], symbol))
+            if weight:
+                x_bits = sum(1 << square for square in distinct if value[square] == 1)
+                o_bits = sum(1 << square for square in distinct if value[square] == 2)
+                table[x_bits | o_bits << self.geometry.squares] = weight
+        return sum(1 << square for square in distinct), table
+
+    # Every position's score, by base-3 index.  The masks and line pattern
+    # numbers are worked out a square at a time for all the positions at once.
+    def position_table(self):
+        geometry = self.geometry
+        count = 3 ** geometry.squares
+        digits = [[index // 3 ** square % 3 for index in range(count)] for square in range(geometry.squares)]
+        x_bits = [0] * count
+        o_bits = [0] * count
+        for square, column in enumerate(digits):
+            bit = 1 << square
+            x_bits = [x | bit if digit == 1 else x for x, digit in zip(x_bits, column)]
+            o_bits = [o | bit if digit == 2 else o for o, digit in zip(o_bits, column)]
+        states = []
+        for line in geometry.lines:
+            state = [0] * count
+            for place, square in enumerate(line):
+                state = [number + digit * 3 ** place for number, digit in zip(state, digits[square])]
+            states.append(state)
+        table = [0] * count
+        if self.line_table is not None:
+            for state in states:
+                table = [score + self.line_table[number] for score, number in zip(table, state)]
+        if self.ownership or self.groups or self.late_empty is not None:
+            table = [score + self.score_rest(x, o, line_states)
+                     for score, x, o, line_states in zip(table, x_bits, o_bits, zip(*states))]
+        return table
+
+    def score(self, board):
+        if self.table is not None:
+            return self.table[board.index]
+        if board.line_states is None:
+            board.track_lines()
+        return self.score_lines(board.x_bits, board.o_bits, board.line_states)
+
+    def score_lines(self, x_bits, o_bits, line_states):
+        score = self.score_rest(x_bits, o_bits, line_states)
+        if self.line_table is not None:
+            line_table = self.line_table
+            score += sum([line_table[state] for state in line_states])
+        return score
+
+    # Everything but the line tables
+    def score_rest(self, x_bits, o_bits, line_states):
+        score = 0
+        mine, theirs = (x_bits, o_bits) if self.mine_is_x else (o_bits, x_bits)
+        for weight, mask in self.ownership:
+            score += weight * (bin(mine & mask).count('1') - bin(theirs & mask).count('1'))
+        shift = self.geometry.squares
+        for mask, table in self.groups:
+            score += table.get(x_bits & mask | (o_bits & mask) << shift, 0)
+        if self.late_empty is not None and shift - bin(x_bits | o_bits).count('1') <= self.late_empty:
+            if self.late_line_table is not None:
+                late_line_table = self.late_line_table
+                score += sum([late_line_table[state] for state in line_states])
+            for mask, table in self.late_groups:
+                score += table.get(x_bits & mask | (o_bits & mask) << shift, 0)
+        return score
+
+
 #-------------------------------- MiniMax ----------------------
 class MinimaxAI:
-    def __init__(self, symbol):
+    deterministic = True
+
+    def __init__(self, symbol, tt=None, alpha_beta=False, stats=None):
         self.symbol = symbol
         self.opponent_symbol = 'O' if symbol == 'X' else 'X'
+        self.tt = tt  # optional TranspositionTable
+        # optional shared alpha-beta search - same moves, far fewer nodes
+        self.engine = AlphaBetaEngine(symbol, self.opponent_symbol, tt=tt) if alpha_beta else None
+        self.stats = None  # optional SearchStats
+        if stats is not None:
+            attach_stats(self, stats)
         self.nodes_evaluated = 0  # Count of nodes checked
         self.max_depth_reached = 0  # Track max depth reached
+        self.nodes_per_second = 0  # Search speed of the last move
 
+    # Node rate on an empty board (549,945 nodes), same machine:
+    #   list board + any(all(...)) check_win:   ~48,000 nodes/sec
+    #   BitBoard masks + WIN_TABLE check_win:  ~230,000 nodes/sec
     def determine_move(self, game):
         # Reset tracking variables for each new move
         self.nodes_evaluated = 0
         self.max_depth_reached = 0
+        start_time = time.perf_counter()
 
         best_score = -float('inf')
         best_move = None
 
-        for move in range(9):
-            if game.is_valid_move(move):
+        if self.engine is not None:
+            best_score, best_moves = self.engine.search(game, True)
+            best_move = best_moves[0]
+            self.nodes_evaluated = self.engine.nodes
+        else:
+            for move in game.legal_moves():
                 #debug_print_on("move: " , move)
-                game.board[move] = self.symbol  # Make a temporary move
+                game.push(move, self.symbol)  # Make a temporary move
                 score = self.minimax(game, 0, False)
-                game.board[move] = ' '  # Undo move
+                game.pop()  # Undo move
 
                 if score > best_score:
                     best_score = score
                     best_move = move
 
+        elapsed = time.perf_counter() - start_time
+        self.nodes_per_second = self.nodes_evaluated / elapsed if elapsed > 0 else 0
+
         debug_print_on(f"Nodes evaluated: {self.nodes_evaluated}")
         debug_print_on(f"Max depth reached: {self.max_depth_reached}")
+        debug_print_on(f"Nodes per second: {self.nodes_per_second:.0f}")
+        if self.tt is not None:
+            debug_print_on(f"Transposition table: {self.tt.stats()}")
+        if self.stats is not None:
+            debug_print_on(self.stats.report())
         return best_move
 
     def minimax(self, game, depth, is_maximizing):
         self.nodes_evaluated += 1
         self.max_depth_reached = max(self.max_depth_reached, depth)
+        stats = self.stats
+        if stats is not None:
+            stats.node(depth, game.board)
+            stats.check_win_calls += 1
 
         if game.check_win(game.board):
+            if stats is not None:
+                stats.leaf(True)
             return -1 if is_maximizing else 1  # Lose if maximizing, win if minimizing
         elif game.is_board_full():
+            if stats is not None:
+                stats.leaf(True)
             return 0  # Draw
 
+        tt_key = None
+        if self.tt is not None:
+            tt_key = self.tt.key(game.board, is_maximizing)
+            entry = self.tt.probe(tt_key)
+            if entry is not None and entry[1] == TranspositionTable.EXACT:
+                return entry[0]
+
         if is_maximizing:
             max_eval = -float('inf')
-            for move in range(9):
-                if game.is_valid_move(move):
-                    game.board[move] = self.symbol
-                    eval = self.minimax(game, depth + 1, False)
-                    game.board[move] = ' '
-                    max_eval = max(max_eval, eval)
-            return max_eval
+            for move in game.legal_moves():
+                game.push(move, self.symbol)
+                eval = self.minimax(game, depth + 1, False)
+                game.pop()
+                max_eval = max(max_eval, eval)
+            value = max_eval
         else:
             min_eval = float('inf')
-            for move in range(9):
-                if game.is_valid_move(move):
-                    game.board[move] = self.opponent_symbol
-                    eval = self.minimax(game, depth + 1, True)
-                    game.board[move] = ' '
-                    min_eval = min(min_eval, eval)
-            return min_eval
+            for move in game.legal_moves():
+                game.push(move, self.opponent_symbol)
+                eval = self.minimax(game, depth + 1, True)
+                game.pop()
+                min_eval = min(min_eval, eval)
+            value = min_eval
+
+        if tt_key is not None:
+            self.tt.store(tt_key, value, TranspositionTable.EXACT, TranspositionTable.FULL_DEPTH)
+        return value
 
 #_________________ MiniMax - enhanced stats ___________________
 class MinimaxAI_stats:
-    def __init__(self, symbol):
+    deterministic = True
+
+    def __init__(self, symbol, tt=None, trace_path=None, trace_every=1000):
         self.symbol = symbol
         self.opponent_symbol = 'O' if symbol == 'X' else 'X'
+        self.tt = tt  # optional TranspositionTable
         self.nodes_evaluated = 0  # Total nodes evaluated
         self.max_depth_reached = 0  # Maximum depth reached in a single call
-        self.config_nodes = []  # Track nodes visited for each configuration
+        # Counters for every move so far (nodes per depth, leaves, move times...).
+        # trace_path writes every trace_every-th board searched to a file
+        self.stats = SearchStats(trace_path, trace_every)
 
     def determine_move(self, game):
         # Reset tracking variables for each move
         self.nodes_evaluated = 0
         self.max_depth_reached = 0
-        self.config_nodes = []
 
         best_score = -float('inf')
         best_move = None
 
-        for move in range(9):
-            if game.is_valid_move(move):
-                game.board[move] = self.symbol  # Make a temporary move
-                score = self.minimax(game, 0, False)
-                game.board[move] = ' '  # Undo move
+        for move in game.legal_moves():
+            game.push(move, self.symbol)  # Make a temporary move
+            score = self.minimax(game, 0, False)
+            game.pop()  # Undo move
 
-                if score > best_score:
-                    best_score = score
-                    best_move = move
+            if score > best_score:
+                best_score = score
+                best_move = move
 
         debug_print_on(f"Nodes evaluated: {self.nodes_evaluated}")
         debug_print_on(f"Max depth reached: {self.max_depth_reached}")
-        debug_print_on("Node visitations per configuration:")
-        for config in self.config_nodes:
-            debug_print_on(config)
+        if self.tt is not None:
+            debug_print_on(f"Transposition table: {self.tt.stats()}")
+        debug_print_on("Search stats so far:")
+        debug_print_on(self.stats.report())
         
         return best_move
 
     def minimax(self, game, depth, is_maximizing):
-        # Track the current board state and number of nodes evaluated at this depth
-        board_state = "".join(game.board)
-        current_nodes = {'board_state': board_state, 'depth': depth, 'nodes_visited': 0}
-        self.config_nodes.append(current_nodes)
+        # Count the node at its depth (and maybe write it to the trace file)
+        stats = self.stats
+        stats.node(depth, game.board)
 
         self.nodes_evaluated += 1
-        current_nodes['nodes_visited'] += 1  # Increment nodes for this configuration
         self.max_depth_reached = max(self.max_depth_reached, depth)
 
         # Terminal condition checks
+        stats.check_win_calls += 1
         if game.check_win(game.board):
+            stats.leaf(True)
             return -1 if is_maximizing else 1  # Lose if maximizing, win if minimizing
         elif game.is_board_full():
+            stats.leaf(True)
             return 0  # Draw
 
+        tt_key = None
+        if self.tt is not None:
+            tt_key = self.tt.key(game.board, is_maximizing)
+            entry = self.tt.probe(tt_key)
+            if entry is not None and entry[1] == TranspositionTable.EXACT:
+                return entry[0]
+
         # Recursive minimax search
         if is_maximizing:
             max_eval = -float('inf')
-            for move in range(9):
-                if game.is_valid_move(move):
-                    game.board[move] = self.symbol
-                    eval = self.minimax(game, depth + 1, False)
-                    game.board[move] = ' '
-                    max_eval = max(max_eval, eval)
-            return max_eval
+            for move in game.legal_moves():
+                game.push(move, self.symbol)
+                eval = self.minimax(game, depth + 1, False)
+                game.pop()
+                max_eval = max(max_eval, eval)
+            value = max_eval
         else:
             min_eval = float('inf')
-            for move in range(9):
-                if game.is_valid_move(move):
-                    game.board[move] = self.opponent_symbol
-                    eval = self.minimax(game, depth + 1, True)
-                    game.board[move] = ' '
-                    min_eval = min(min_eval, eval)
-            return min_eval
+            for move in game.legal_moves():
+                game.push(move, self.opponent_symbol)
+                eval = self.minimax(game, depth + 1, True)
+                game.pop()
+                min_eval = min(min_eval, eval)
+            value = min_eval
+
+        if tt_key is not None:
+            self.tt.store(tt_key, value, TranspositionTable.EXACT, TranspositionTable.FULL_DEPTH)
+        return value
 
 
 #________________________ MINIMAX Depth limit with Eval________________
+# Score of one line - cells as in Heuristic
+def depth_eval_line(cells):
+    near_win = len(cells) - 1
+    player_count, opponent_count = cells.count('M'), cells.count('T')
+    score = 0
+    if player_count == near_win and opponent_count == 0:
+        score += 10  # Favorable near-win
+    elif 0 < player_count < near_win and opponent_count == 0:
+        score += 1  # Slightly favorable
+
+    if opponent_count == near_win and player_count == 0:
+        score -= 10  # Opponent near-win
+    elif 0 < opponent_count < near_win and player_count == 0:
+        score -= 1  # Slightly unfavorable
+    return score
+
+DEPTH_EVAL_HEURISTIC = Heuristic(line=depth_eval_line)
+
 class MinimaxAI_depth_Eval:
-    def __init__(self, symbol, max_depth=None):
+    deterministic = True
+
+    def __init__(self, symbol, max_depth=None, alpha_beta=False, time_budget=None, tt=None):
         self.symbol = symbol
         self.opponent_symbol = 'O' if symbol == 'X' else 'X'
         self.max_depth = max_depth if max_depth is not None else float('inf')  # Full depth if not specified
+        self.time_budget = time_budget  # seconds per move - deepens one ply at a time up to max_depth
+        self.deterministic = time_budget is None  # with a budget, how deep it gets depends on the clock
+        self.tt = tt  # optional TranspositionTable, only used by the alpha-beta engine
+        self.engine = None
+        if alpha_beta or time_budget is not None:
+            self.engine = AlphaBetaEngine(symbol, self.opponent_symbol, horizon=self.horizon, tt=tt)
+        self.heuristic = DEPTH_EVAL_HEURISTIC
 
     def determine_move(self, game):
-        _, move, self.nodes_visited = self.minimax(game, self.symbol, depth=0)
+        if self.time_budget is not None and self.max_depth >= 1:
+            _, best_moves = self.engine.deepen(game, True, self.max_depth - 1, self.time_budget)
+            self.nodes_visited = self.engine.nodes + 1
+            move = best_moves[0]
+        elif self.engine is not None and self.max_depth >= 1:
+            # root moves are made at depth 0, so their replies have max_depth - 1 plies left
+            _, best_moves = self.engine.search(game, True, self.max_depth - 1)
+            self.nodes_visited = self.engine.nodes + 1
+            move = best_moves[0]
+        else:
+            _, move, self.nodes_visited = self.minimax(game, self.symbol, depth=0)
+        game.board.track_lines(False)  # if evaluate turned it on - so the other player's moves don't pay for it
         return move
 
+    # Alpha-beta engine leaf score
+    def horizon(self, game, maximizing):
+        return self.evaluate(game)
+
     def minimax(self, game, current_symbol, depth):
         if game.check_win(game.board):
             return (1 if current_symbol == self.opponent_symbol else -1, None, 1)  # Win, no move, node count 1
@@ -611,50 +1751,168 @@ class MinimaxAI_depth_Eval:
         best_move = None
         nodes_visited = 0
 
-        for move in range(9):
-            if game.is_valid_move(move):
-                game.board[move] = current_symbol
-                score, _, node_count = self.minimax(
-                    game, 
-                    self.opponent_symbol if current_symbol == self.symbol else self.symbol, 
-                    depth + 1
-                )
-                nodes_visited += node_count
-                game.board[move] = ' '  # Undo move
-
-                if current_symbol == self.symbol:
-                    if score > best_score:
-                        best_score, best_move = score, move
-                else:
-                    if score < best_score:
-                        best_score, best_move = score, move
+        for move in game.legal_moves():
+            game.push(move, current_symbol)
+            score, _, node_count = self.minimax(
+                game, 
+                self.opponent_symbol if current_symbol == self.symbol else self.symbol, 
+                depth + 1
+            )
+            nodes_visited += node_count
+            game.pop()  # Undo move
+
+            if current_symbol == self.symbol:
+                if score > best_score:
+                    best_score, best_move = score, move
+            else:
+                if score < best_score:
+                    best_score, best_move = score, move
 
         debug_print_on (f"best_score:  {score} depth: {depth}")
         return best_score, best_move, nodes_visited + 1  # Total nodes visited for this call
 
+    # Sum of depth_eval_line over every line (rows, columns, diagonals), from
+    # the tables DEPTH_EVAL_HEURISTIC compiles
     def evaluate(self, game):
-        score = 0
-        win_conditions = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-            [0, 4, 8], [2, 4, 6]  # Diagonals
-        ]
+        return self.heuristic.score(game.board, self.symbol)
 
-        for condition in win_conditions:
-            player_count = sum(1 for i in condition if game.board[i] == self.symbol)
-            opponent_count = sum(1 for i in condition if game.board[i] == self.opponent_symbol)
 
-            if player_count == 2 and opponent_count == 0:
-                score += 10  # Favorable near-win
-            elif player_count == 1 and opponent_count == 0:
-                score += 1  # Slightly favorable
+#________________________ Solved table (perfect play) ________________
+# There are only a few thousand positions reachable from the empty board, so we
+# solve all of them once and write the answers to a small binary file.  The file
+# is memory-mapped by SolvedTableAI, so a move is a single index lookup and any
+# number of processes share the same pages.
+#
+# File layout: 8-byte magic, then two planes of 3**9 little-endian uint16 entries
+# (plane 0 = X to move, plane 1 = O to move), indexed by the base-3 board index.
+#   bits 0-8:  optimal moves (bit i set = square i is optimal)
+#   bits 9-10: value for the side to move + 1 (0 = loss, 1 = draw, 2 = win)
+#   bit 15:    position is reachable and the game is not over
+SOLVED_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_solved.bin")
+SOLVED_MAGIC = b"TTTSOLV1"
+SOLVED_ENTRY_SIZE = 2
+SOLVED_PLANE = 3 ** 9
+SOLVED_REACHABLE = 1 << 15
+
+# Solve every position reachable with either X or O moving first.
+# Returns {(x_bits, o_bits, mover): (value, best_moves_mask)}, mover 0 = X, 1 = O.
+# Values are from the mover's point of view and ignore how soon the game ends,
+# exactly like MinimaxAI, so the lowest optimal square is MinimaxAI's move.
+def solve_all_positions():
+    solved = {}
+
+    def solve(x_bits, o_bits, mover):
+        key = (x_bits, o_bits, mover)
+        if key in solved:
+            return solved[key][0]
+        mine, theirs = (x_bits, o_bits) if mover == 0 else (o_bits, x_bits)
+        best_value = -2
+        best_moves = 0
+        for move in range(9):
+            if (x_bits | o_bits) & BIT[move]:
+                continue
+            after = mine | BIT[move]
+            if WIN_TABLE[after]:
+                value = 1
+            elif after | theirs == FULL_MASK:
+                value = 0
+            elif mover == 0:
+                value = -solve(after, o_bits, 1)
+            else:
+                value = -solve(x_bits, after, 0)
+            if value > best_value:
+                best_value, best_moves = value, BIT[move]
+            elif value == best_value:
+                best_moves |= BIT[move]
+        solved[key] = (best_value, best_moves)
+        return best_value
+
+    solve(0, 0, 0)
+    solve(0, 0, 1)
+    return solved
+
+def mask_to_index(x_bits, o_bits):
+    index = 0
+    for i in range(9):
+        if x_bits & BIT[i]:
+            index += POW3[i]
+        elif o_bits & BIT[i]:
+            index += 2 * POW3[i]
+    return index
+
+# One-time build of the solved table file
+def build_solved_table(path=SOLVED_TABLE_PATH):
+    entries = array('H', bytes(SOLVED_ENTRY_SIZE * 2 * SOLVED_PLANE))
+    for (x_bits, o_bits, mover), (value, best_moves) in solve_all_positions().items():
+        entry = SOLVED_REACHABLE | ((value + 1) << 9) | best_moves
+        entries[mover * SOLVED_PLANE + mask_to_index(x_bits, o_bits)] = entry
+    if sys.byteorder == 'big':
+        entries.byteswap()
+
+    # write to a temporary file first so readers never see a half-written table
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(SOLVED_MAGIC)
+        f.write(entries.tobytes())
+    os.replace(tmp_path, path)
+    print_on(f"Solved table written to {path}")
+
+class SolvedTableAI:
+    deterministic = True
+
+    def __init__(self, symbol, path=SOLVED_TABLE_PATH):
+        self.symbol = symbol
+        self.path = path
+        self.table = None  # memory-mapped on first use
+
+    # The mapping isn't sent to other processes, each one maps the file itself
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['table'] = None
+        return state
+
+    def open_table(self):
+        if not os.path.exists(self.path):
+            build_solved_table(self.path)
+        with open(self.path, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if table[:len(SOLVED_MAGIC)] != SOLVED_MAGIC or len(table) != len(SOLVED_MAGIC) + SOLVED_ENTRY_SIZE * 2 * SOLVED_PLANE:
+            table.close()
+            raise ValueError(f"{self.path} is not a solved tic-tac-toe table")
+        self.table = table
+
+    # Raw table entry for a board (list or BitBoard) with symbol to move
+    def lookup(self, board, symbol):
+        if self.table is None:
+            self.open_table()
+        index = board.index if type(board) is BitBoard else board_index(board)
+        plane = 0 if symbol == 'X' else 1
+        offset = len(SOLVED_MAGIC) + SOLVED_ENTRY_SIZE * (plane * SOLVED_PLANE + index)
+        return struct.unpack_from('<H', self.table, offset)[0]
 
-            if opponent_count == 2 and player_count == 0:
-                score -= 10  # Opponent near-win
-            elif opponent_count == 1 and player_count == 0:
-                score -= 1  # Slightly unfavorable
+    def determine_move(self, game):
+        if len(game.board) != 9:
+            raise ValueError("SolvedTableAI only knows the 3x3 game")
+        entry = self.lookup(game.board, self.symbol)
+        best_moves = entry & FULL_MASK
+        if not entry & SOLVED_REACHABLE or not best_moves:
+            # position can't come from a normal game - just take the first open square
+            for move in range(9):
+                if game.is_valid_move(move):
+                    return move
+        return (best_moves & -best_moves).bit_length() - 1  # lowest optimal square
 
-        return score
+    # Batch version (see Batch moves) - the same lookup for every position at once
+    def determine_moves(self, x_bits, o_bits, symbols):
+        if self.table is None:
+            self.open_table()
+        x_bits, o_bits = np.asarray(x_bits, dtype=np.intp), np.asarray(o_bits, dtype=np.intp)
+        planes = batch_is_o(symbols, len(x_bits))
+        entries = np.frombuffer(self.table, dtype='<u2', offset=len(SOLVED_MAGIC))
+        entries = entries[planes * SOLVED_PLANE + batch_index(x_bits, o_bits)]
+        best_moves = np.where(entries & SOLVED_REACHABLE, entries & FULL_MASK, 0)
+        best_moves = np.where(best_moves != 0, best_moves, ~(x_bits | o_bits) & FULL_MASK)  # first open square otherwise
+        return _batch_tables()[2][best_moves]
 
 
 # @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
@@ -664,27 +1922,49 @@ class MinimaxAI_depth_Eval:
 #
 # Aaron Mike Aaron Mike Aaron Mike Aaron Mike Aaron Mike Aaron Mike Aaron Mike
 #
+# +1 if we have the center and a corner, -1 if they do (just square 4 is the center on the 3x3 board)
+def center_and_corner(geometry):
+    center = len(geometry.center)
+    def score(cells):
+        if 'M' in cells[:center] and 'M' in cells[center:]:
+            return 1
+        if 'T' in cells[:center] and 'T' in cells[center:]:
+            return -1
+        return 0
+    return geometry.center + geometry.corners, score
+
+AARON_MIKE_HEURISTIC = Heuristic(groups=[center_and_corner])
+
 class AaronMikeMinimax:
-    def __init__(self, symbol):
+    deterministic = True
+
+    def __init__(self, symbol, tt=None, alpha_beta=False, maxdepth=None, time_budget=None):
         self.mysymbol = symbol
         if symbol == 'O':
             enemysymbol = 'X'
         else:
             enemysymbol = 'O'
         self.enemysymbol = enemysymbol
+        self.time_budget = time_budget # seconds per move, searches deeper until it runs out
+        self.deterministic = time_budget is None # how deep it gets depends on the clock
+        if maxdepth is None: # 1 ply, or as deep as the time allows
+            maxdepth = 1 if time_budget is None else TranspositionTable.FULL_DEPTH
+        self.maxdepth = maxdepth
+        #change this number to whatever depth you want it to go to
+        self.tt = tt  # optional TranspositionTable
+        self.engine = None
+        if alpha_beta or time_budget is not None: # same search, done by the shared alpha-beta engine
+            self.engine = AlphaBetaEngine(symbol, enemysymbol, horizon=self.horizon, tt=tt)
+
+    def horizon(self, game, maximizing):
+        return self.depthevalfunc(game)
 
     def depthevalfunc(self, game):
-        if (game.board[4] == self.mysymbol) and (game.board[8] == self.mysymbol or game.board[6] == self.mysymbol or game.board[0] == self.mysymbol or game.board[2] == self.mysymbol):
-            return 1
-        if (game.board[4] == self.enemysymbol) and (game.board[8] == self.enemysymbol or game.board[6] == self.enemysymbol or game.board[0] == self.enemysymbol or game.board[2] == self.enemysymbol):
-            return -1
-        else:
-            return 0
+        return AARON_MIKE_HEURISTIC.score(game.board, self.mysymbol) #center and corner, see center_and_corner
 
 
     def minimax_evaluation (self, game, arewemaximizing, curdepth):
-        maxdepth = 1 
-        #change this number to whatever depth you want it to go to
+        maxdepth = self.maxdepth
 
         if game.check_win(game.board) == True:
             if arewemaximizing == False:
@@ -698,44 +1978,57 @@ class AaronMikeMinimax:
             best_value = self.depthevalfunc(game)
             return best_value
 
+        tt_key = None
+        if self.tt is not None: # seen this position with at least as much depth left?
+            tt_key = self.tt.key(game.board, arewemaximizing, maxdepth - curdepth)
+            entry = self.tt.probe(tt_key)
+            if entry is not None and entry[1] == TranspositionTable.EXACT:
+                return entry[0]
         
         if arewemaximizing == True:
             best_value = -float('inf')
-            for move in range(9):
-                if game.is_valid_move(move):
-                    game.board[move] = self.mysymbol
-                    valueofmove = self.minimax_evaluation(game, False, curdepth+1)
-                    game.board[move] = ' '
-                    best_value = max(valueofmove, best_value)
-            return best_value
+            for move in game.legal_moves():
+                game.push(move, self.mysymbol)
+                valueofmove = self.minimax_evaluation(game, False, curdepth+1)
+                game.pop()
+                best_value = max(valueofmove, best_value)
         
         else:
             best_value = float('inf')
-            for move in range(9):
-                if game.is_valid_move(move):
-                    game.board[move] = self.enemysymbol
-                    valueofmove = self.minimax_evaluation(game, True, curdepth+1)
-                    game.board[move] = ' '
-                    best_value = min(valueofmove, best_value)
-            return best_value
+            for move in game.legal_moves():
+                game.push(move, self.enemysymbol)
+                valueofmove = self.minimax_evaluation(game, True, curdepth+1)
+                game.pop()
+                best_value = min(valueofmove, best_value)
+
+        if tt_key is not None:
+            self.tt.store(tt_key, best_value, TranspositionTable.EXACT, maxdepth - curdepth)
+        return best_value
 
     def determine_move(self, game):
         best_value = -float('inf')
         best_move = None # Store the current best move for AI
         curdepth = 0
 
+        if self.time_budget is not None:
+            best_value, best_moves = self.engine.deepen(game, True, self.maxdepth, self.time_budget)
+            return best_moves[0]
+
+        if self.engine is not None:
+            # our move is made at curdepth 0, so the engine gets maxdepth plies after it
+            best_value, best_moves = self.engine.search(game, True, self.maxdepth)
+            return best_moves[0]
 
         #going through the spaces of the board/list indexes
-        for move in range(9):
-            if game.is_valid_move(move): # Check if space is empty
-                game.board[move] = self.mysymbol  # Simulate AI move
-                valueofmove = self.minimax_evaluation(game, False, curdepth)
-                game.board[move] = ' '
-                
-                # If this move has a better value, update the best move
-                if valueofmove > best_value:
-                    best_value = valueofmove # Update the best value found so far
-                    best_move = move # Update the best move to the current move
+        for move in game.legal_moves(): # only the empty spaces
+            game.push(move, self.mysymbol)  # Simulate AI move
+            valueofmove = self.minimax_evaluation(game, False, curdepth)
+            game.pop()
+            
+            # If this move has a better value, update the best move
+            if valueofmove > best_value:
+                best_value = valueofmove # Update the best value found so far
+                best_move = move # Update the best move to the current move
 
         # Return the board location of the best move for the AI (the list index)
         return best_move
@@ -745,13 +2038,26 @@ class AaronMikeMinimax:
 # @@@@
 
 class Felix_Jesse_Depth_limit:
-    def __init__(self,symbol): #sets symbol for AI so that it can play O or X
+    deterministic = True
+
+    def __init__(self,symbol, tt=None, alpha_beta=False, limit=None): #sets symbol for AI so that it can play O or X
         self.symbol=symbol
         if symbol=='X':
             self.opponent_symbol='O'
         else:
             self.opponent_symbol='X'
-        self.limit = int(input("what should the limit be? "))
+        if limit is None: #ask if it wasn't given (the tournament can't answer input())
+            limit = int(input("what should the limit be? "))
+        self.limit = limit
+        self.tt = tt #optional TranspositionTable
+        self.engine = None
+        if alpha_beta:
+            self.engine = AlphaBetaEngine(symbol, self.opponent_symbol, horizon=self.horizon, tt=tt)
+
+    #past the limit FJ_limit hands back the parent's starting score, so a position
+    #at the limit is worth -inf to the maximizer and +inf to the minimizer
+    def horizon(self, game, maximizing):
+        return -float('inf') if maximizing else float('inf')
 
     def FJ_limit(self, game, depth, maximizing, best_score):
         if depth <= self.limit:
@@ -764,24 +2070,32 @@ class Felix_Jesse_Depth_limit:
             elif game.is_board_full():
                 return 0
 
+            #inside the limit the score only depends on the board, whose turn it is and how deep we can still go
+            tt_key = None
+            if self.tt is not None:
+                tt_key = self.tt.key(game.board, maximizing, self.limit - depth)
+                entry = self.tt.probe(tt_key)
+                if entry is not None and entry[1] == TranspositionTable.EXACT:
+                    return entry[0]
+
             if maximizing:
                 best_score = -float('inf') #best score starts low at negative infinity
-                for move in range(9): #each space in 3x3 grid
-                    if game.is_valid_move(move):
-                        game.make_move(move, self.symbol) #test move
-                        score = self.FJ_limit(game, depth+1, False, best_score) #recursion! (calls as minimizer)
-                        game.board[move] = ' ' #undo move
-                        best_score = max(score, best_score) #update score
-                return best_score
+                for move in game.legal_moves(): #each empty space in 3x3 grid
+                    game.push(move, self.symbol) #test move
+                    score = self.FJ_limit(game, depth+1, False, best_score) #recursion! (calls as minimizer)
+                    game.pop() #undo move
+                    best_score = max(score, best_score) #update score
             else: #is minimizer
                 best_score = float('inf') #set best at infinity (so we can only go down)
-                for move in range(9): #pretty much the same
-                    if game.is_valid_move(move):
-                        game.make_move(move, self.opponent_symbol) #moves p2 bc its minimizing
-                        score = self.FJ_limit(game, depth+1, True, best_score) #recurs as max
-                        game.board[move] = ' '
-                        best_score = min(score, best_score)
-                return best_score
+                for move in game.legal_moves(): #pretty much the same
+                    game.push(move, self.opponent_symbol) #moves p2 bc its minimizing
+                    score = self.FJ_limit(game, depth+1, True, best_score) #recurs as max
+                    game.pop()
+                    best_score = min(score, best_score)
+
+            if tt_key is not None:
+                self.tt.store(tt_key, best_score, TranspositionTable.EXACT, self.limit - depth)
+            return best_score
         else:
             return best_score
 
@@ -789,15 +2103,18 @@ class Felix_Jesse_Depth_limit:
         best_move = None
         best_score = -float('inf') #set best score to negative infinity
 
-        for move in range(9): #loop through all possible moves on the 3x3 board
-            if game.is_valid_move(move):
-                game.make_move(move, self.symbol) #ai test plays player 1
-                score = self.FJ_limit(game, 0, False, best_score)  #call minimax using min for the next player.
-                game.board[move] = ' '  #undo move 
-                #update the best score if one is found
-                if score > best_score or (score == best_score and best_move is None):
-                    best_score = score
-                    best_move = move
+        if self.engine is not None and self.limit >= 0:
+            best_score, best_moves = self.engine.search(game, True, self.limit)
+            return best_moves[0]
+
+        for move in game.legal_moves(): #loop through all possible moves on the 3x3 board
+            game.push(move, self.symbol) #ai test plays player 1
+            score = self.FJ_limit(game, 0, False, best_score)  #call minimax using min for the next player.
+            game.pop()  #undo move 
+            #update the best score if one is found
+            if score > best_score or (score == best_score and best_move is None):
+                best_score = score
+                best_move = move
 
         return best_move
     
@@ -806,14 +2123,33 @@ class Felix_Jesse_Depth_limit:
 # @@@
 
 # Helper Tree class for MiniMax, implemented by Giancarlo
+# Nodes are kept small: the position is stored as its base-3 index (see
+# board_index) instead of a list, and buildTree gives every path that reaches
+# the same position the same node - so the tree is really a DAG.
 class TreeNode:
-    def __init__(self, board, score):
-        self.board = board
+    __slots__ = ('position', 'squares', 'score', 'children')
+
+    def __init__(self, board, score, squares=9):
+        if isinstance(board, int):  # already a position index
+            self.position, self.squares = board, squares
+        else:
+            self.position = board.index if type(board) is BitBoard else board_index(board)
+            self.squares = len(board)
         self.score = score
-        self.children = []
+        self.children = ()
+
+    # The position as a list of ' ', 'X' and 'O'
+    @property
+    def board(self):
+        board = []
+        position = self.position
+        for _ in range(self.squares):
+            position, digit = divmod(position, 3)
+            board.append(' XO'[digit])
+        return board
 
     def add_child(self, child_node):
-        self.children.append(child_node)
+        self.children += (child_node,)
     
     def print_tree(self, level=0):
         indent = "  " * level
@@ -823,17 +2159,24 @@ class TreeNode:
             if isinstance(child, TreeNode):
                 child.print_tree(level + 1)
                 
-    def dfs(self, target_score, depth, find_max):
-        # Base case: if the node has the target score and is a leaf, return its depth
-        if self.score == target_score and not self.children:
-            return depth
-
-        # Recursive case: explore children
-        depths = [
-            child.dfs(target_score, depth + 1, find_max) for child in self.children
-            if (find_max and child.score >= target_score) or (not find_max and child.score <= target_score)
-        ]
-        return min(depths, default=float('inf'))
+    def dfs(self, target_score, depth, find_max, memo=None):
+        # The answer below a node doesn't depend on how deep the node is, so a
+        # shared node is only searched once - memo holds node -> depth below it
+        if memo is None:
+            memo = {}
+        below = memo.get(self)
+        if below is None:
+            # Base case: if the node has the target score and is a leaf, it's depth 0
+            if self.score == target_score and not self.children:
+                below = 0
+            else:
+                # Recursive case: explore children
+                below = min((
+                    child.dfs(target_score, 1, find_max, memo) for child in self.children
+                    if (find_max and child.score >= target_score) or (not find_max and child.score <= target_score)
+                ), default=float('inf'))
+            memo[self] = below
+        return depth + below
     
     """
     Finds the depth of the shallowest node with the target score.
@@ -852,52 +2195,63 @@ The algorithm assumes the other player will always play optimally.
 Implemented by Gabe and Giancarlo 
 '''
 class MiniMaxGG:
+    deterministic = True
 
-    def __init__(self, symbol):
+    def __init__(self, symbol, alpha_beta=False):
         self.symbol = symbol
+        self.opponent = 'X' if symbol == 'O' else 'O'
+        # With alpha_beta the shared engine picks the same move without building the tree
+        self.engine = AlphaBetaEngine(symbol, self.opponent) if alpha_beta else None
+        self.nodes = None  # (position, turn) -> TreeNode while buildTree runs
 
     # Helper function; different from your is_board_full as it asks for a board 
     # instead of checking the object's board field
     def is_board_full(self, board):
         return ' ' not in board
 
-    # Build the tree and assign scores based on the leaf nodes
+    # Build the tree and assign scores based on the leaf nodes.
+    # board is the game's board - moves are pushed and popped on the game in
+    # place, and a position that was already built (self.nodes) reuses the same node.
     def buildTree(self, board, turn):
+        key = (board.index, turn)
+        node = self.nodes.get(key)
+        if node is not None:
+            return node
+
         # Base cases
         winner = None
-        if game.check_win(board):
+        if self.game.check_win(board):
             winner = 'X' if turn == 'O' else 'O'
         if winner:
-            return TreeNode(board, 1 if winner == self.symbol else -1)
-        if self.is_board_full(board):
-            return TreeNode(board, 0)
-
-        # Create root node for current board
-        root = TreeNode(board[:], 0)
+            node = TreeNode(board, 1 if winner == self.symbol else -1)
+        elif self.is_board_full(board):
+            node = TreeNode(board, 0)
+        else:
+            # Create root node for current board
+            node = TreeNode(board, 0)
 
-        # Initialize list to store scores of child nodes
-        child_scores = []
+            # Initialize list to store child nodes
+            children = []
 
-        # Iterate through available moves
-        for move in range(9):
-            if board[move] == ' ':
+            # Iterate through available moves
+            next_turn = 'X' if turn == 'O' else 'O'
+            for move in self.game.legal_moves():
                 # Make the move
-                board[move] = turn
+                self.game.push(move, turn)
                 # Recursively call buildTree on the new board state
-                next_turn = 'X' if turn == 'O' else 'O'
-                child_node = self.buildTree(board[:], next_turn)
-                root.add_child(child_node)
-                child_scores.append(child_node.score)
+                children.append(self.buildTree(board, next_turn))
                 # Undo the move
-                board[move] = ' '
+                self.game.pop()
+            node.children = tuple(children)
 
-        # Assign score to root based on children's scores
-        if turn == self.symbol:
-            root.score = max(child_scores)
-        else:
-            root.score = min(child_scores)
+            # Assign score to root based on children's scores
+            if turn == self.symbol:
+                node.score = max(child.score for child in children)
+            else:
+                node.score = min(child.score for child in children)
 
-        return root
+        self.nodes[key] = node
+        return node
 
     # Pick the first good move on the children array
     def pickMove(self):
@@ -909,20 +2263,108 @@ class MiniMaxGG:
         best_move = best_moves[0]
 
         # Find the move that resulted in this board
-        for tile in range(len(game.board)):
-            if game.board[tile] != best_move.board[tile]:
+        for tile in range(len(self.game.board)):
+            if self.game.board[tile] != best_move.board[tile]:
                 return tile
 
     def determine_move(self, game):
-        board = game.board[:]
-        self.root = self.buildTree(board, self.symbol)
+        if self.engine is not None:
+            return self.engine.search(game, True)[1][0]
+        self.game = game  # used by buildTree and pickMove
+        self.nodes = {}
+        self.root = self.buildTree(game.board, self.symbol)
+        self.nodes = None
         return self.pickMove()
     
+# MiniMaxDepthGG's evaluation weights (see the list in the class).  Penalties
+# are listed as positive numbers and subtracted.  The tune command searches for
+# better ones.
+GG_WEIGHTS = {
+    'center': 3, 'corner': 2, 'edge': 1,          # owning a square
+    'win_threat': 50, 'block_threat': 50,         # k-1 of ours / theirs and one empty in a line
+    'fork': 5, 'opponent_fork': 10,               # one of ours / theirs and the rest empty
+    'open_line': 1, 'opponent_open_line': 1,      # per mark in a line the other side isn't in
+    'symmetry': 1,                                # a corner of ours with the opposite corner empty
+    'late_win': 20, 'late_block': 20,             # threats on the last diagonal with 3 or fewer squares left
+}
+
+# The pieces of the evaluation, cells as in Heuristic
+def gg_squares(geometry, weights=GG_WEIGHTS):
+    center, corners = geometry.center, geometry.corners
+    return [weights['center'] * (square in center) + weights['corner'] * (square in corners)
+            if square in center or square in corners else weights['edge'] for square in range(geometry.squares)]
+
+def gg_line(cells, weights=GG_WEIGHTS):
+    k = len(cells)
+    player_count, opponent_count = cells.count('M'), cells.count('T')
+    empty_count = k - player_count - opponent_count
+    score = 0
+
+    if player_count == k - 1 and empty_count == 1:
+        score += weights['win_threat']  # Immediate win
+    if opponent_count == k - 1 and empty_count == 1:
+        score -= weights['block_threat']  # Immediate block
+
+    if player_count == 1 and empty_count == k - 1:
+        score += weights['fork']  # Encourage creating forks
+    if opponent_count == 1 and empty_count == k - 1:
+        score -= weights['opponent_fork']  # Discourage opponent forks
+
+    if player_count > 0 and opponent_count == 0:
+        score += weights['open_line'] * player_count  # Potential winning line
+    elif opponent_count > 0 and player_count == 0:
+        score -= weights['opponent_open_line'] * opponent_count  # Opponent's potential winning line
+    return score
+
+# Symmetry bonus - for each corner we have with the opposite corner still empty
+def gg_symmetry(geometry, weights=GG_WEIGHTS):
+    bonus = weights['symmetry']
+    return geometry.corners, lambda cells: bonus * ((cells[0] == 'M' and cells[3] == ' ') + (cells[1] == 'M' and cells[2] == ' '))
+
+# Late game - only the last line checked (the last diagonal) counts, as it always has
+def gg_late_line(geometry, weights=GG_WEIGHTS):
+    def score(cells):
+        k = len(cells)
+        player_count, opponent_count = cells.count('M'), cells.count('T')
+        empty_count = k - player_count - opponent_count
+        score = 0
+        if player_count == k - 1 and empty_count == 1:
+            score += weights['late_win']  # Late-game boost for completing lines
+        if opponent_count == k - 1 and empty_count == 1:
+            score -= weights['late_block']  # Late-game boost for blocking threats
+        return score
+    return geometry.lines[-1], score
+
+_gg_heuristics = {}
+
+# The Heuristic for a set of weights - one per set, so its tables are only compiled once
+def gg_heuristic(weights=GG_WEIGHTS):
+    key = tuple(sorted(weights.items()))
+    if key not in _gg_heuristics:
+        weights = dict(weights)
+        _gg_heuristics[key] = Heuristic(line=functools.partial(gg_line, weights=weights),
+                                        squares=functools.partial(gg_squares, weights=weights),
+                                        groups=[functools.partial(gg_symmetry, weights=weights)],
+                                        late_empty=3, late_groups=[functools.partial(gg_late_line, weights=weights)])
+    return _gg_heuristics[key]
+
+GG_HEURISTIC = gg_heuristic()
+
 class MiniMaxDepthGG(MiniMaxGG):
 
-    def __init__(self, symbol, depth):
+    def __init__(self, symbol, depth, alpha_beta=False, time_budget=None, weights=None):
         super().__init__(symbol)
         self.depth = depth
+        self.time_budget = time_budget # seconds per move; depth becomes the deepest it may go
+        self.deterministic = time_budget is None # how deep it gets depends on the clock
+        # weights: changes to GG_WEIGHTS, e.g. {'center': 5}
+        self.heuristic = GG_HEURISTIC if weights is None else gg_heuristic({**GG_WEIGHTS, **weights})
+        if alpha_beta or time_budget is not None:
+            self.engine = AlphaBetaEngine(symbol, self.opponent, win_score=1000, horizon=self.horizon)
+
+    # Alpha-beta leaf score - for the side to move, like buildTree does
+    def horizon(self, game, maximizing):
+        return self.evaluate(game.board, self.symbol if maximizing else self.opponent)
     
     '''
     Scores if leaf node is reached:
@@ -955,124 +2397,72 @@ class MiniMaxDepthGG(MiniMaxGG):
     +20: completing a line with two player symbols and one empty space (prioritized in late game)
     -20: blocking a line with two opponent symbols and one empty space (prioritized in late game)
     '''
+    # All of the above is in GG_HEURISTIC's tables, so this is a lookup or two
     def evaluate(self, board, player):
-        opponent = 'X' if player == 'O' else 'O'
-        score = 0
-
-        # Positional advantage
-        center = 4
-        corners = [0, 2, 6, 8]
-        edges = [1, 3, 5, 7]
-
-        # Center control
-        if board[center] == player:
-            score += 3
-        elif board[center] == opponent:
-            score -= 3
-
-        # Corner control
-        for corner in corners:
-            if board[corner] == player:
-                score += 2
-            elif board[corner] == opponent:
-                score -= 2
-
-        # Edge control
-        for edge in edges:
-            if board[edge] == player:
-                score += 1
-            elif board[edge] == opponent:
-                score -= 1
-
-        # Line evaluation and advanced heuristics
-        winning_lines = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-            [0, 4, 8], [2, 4, 6]             # Diagonals
-        ]
+        if type(board) is not BitBoard:
+            board = BitBoard(board, self.game.board.geometry)
+        return self.heuristic.score(board, player)
 
-        for line in winning_lines:
-            player_count = sum(1 for i in line if board[i] == player)
-            opponent_count = sum(1 for i in line if board[i] == opponent)
-            empty_count = sum(1 for i in line if board[i] == ' ')
-
-            if player_count == 2 and empty_count == 1:
-                score += 50  # Immediate win
-            if opponent_count == 2 and empty_count == 1:
-                score -= 50  # Immediate block
-
-            if player_count == 1 and empty_count == 2:
-                score += 5  # Encourage creating forks
-            if opponent_count == 1 and empty_count == 2:
-                score -= 10  # Discourage opponent forks
-
-            if player_count > 0 and opponent_count == 0:
-                score += player_count  # Potential winning line
-            elif opponent_count > 0 and player_count == 0:
-                score -= opponent_count  # Opponent's potential winning line
-
-        # Symmetry bonus
-        if board[0] == player and board[8] == ' ':
-            score += 1
-        if board[2] == player and board[6] == ' ':
-            score += 1
-
-        # Late-game adjustments
-        empty_spaces = sum(1 for i in board if i == ' ')
-        if empty_spaces <= 3:
-            if player_count == 2 and empty_count == 1:
-                score += 20  # Late-game boost for completing lines
-            if opponent_count == 2 and empty_count == 1:
-                score -= 20  # Late-game boost for blocking threats
-
-        return score
-
-
-    # Build Tree according the depth limitation, if leaf is not reached use the above eval function
+    # Build Tree according the depth limitation, if leaf is not reached use the above eval function.
+    # Same in-place board and shared nodes as MiniMaxGG.buildTree (a position
+    # always comes up at the same depth, so depth isn't part of the key).
     def buildTree(self, board, turn, depth):
+        key = (board.index, turn)
+        node = self.nodes.get(key)
+        if node is not None:
+            return node
+
         # Base cases
         winner = None
-        if game.check_win(board):
+        if self.game.check_win(board):
             winner = 'X' if turn == 'O' else 'O'
         if winner:
-            return TreeNode(board, 1000 if winner == self.symbol else -1000)
-        if self.is_board_full(board):
-            return TreeNode(board, 0)
-        
-        # No leaf node was reached, call eval function to determine score
-        if depth == 0:
-            return TreeNode(board, self.evaluate(board, turn))
-
-        # Create root node for current board
-        root = TreeNode(board[:], 0)
+            node = TreeNode(board, 1000 if winner == self.symbol else -1000)
+        elif self.is_board_full(board):
+            node = TreeNode(board, 0)
+        elif depth == 0:
+            # No leaf node was reached, call eval function to determine score
+            node = TreeNode(board, self.evaluate(board, turn))
+        else:
+            # Create root node for current board
+            node = TreeNode(board, 0)
 
-        # Initialize list to store scores of child nodes
-        child_scores = []
+            # Initialize list to store child nodes
+            children = []
 
-        # Iterate through available moves
-        for move in range(9):
-            if board[move] == ' ':
+            # Iterate through available moves
+            next_turn = 'X' if turn == 'O' else 'O'
+            for move in self.game.legal_moves():
                 # Make the move
-                board[move] = turn
+                self.game.push(move, turn)
                 # Recursively call buildTree on the new board state
-                next_turn = 'X' if turn == 'O' else 'O'
-                child_node = self.buildTree(board[:], next_turn, depth-1)
-                root.add_child(child_node)
-                child_scores.append(child_node.score)
+                children.append(self.buildTree(board, next_turn, depth-1))
                 # Undo the move
-                board[move] = ' '
+                self.game.pop()
+            node.children = tuple(children)
 
-        # Assign score to root based on children's scores
-        if turn == self.symbol:
-            root.score = max(child_scores)
-        else:
-            root.score = min(child_scores)
+            # Assign score to root based on children's scores
+            if turn == self.symbol:
+                node.score = max(child.score for child in children)
+            else:
+                node.score = min(child.score for child in children)
 
-        return root
+        self.nodes[key] = node
+        return node
     
     def determine_move(self, game):
-        board = game.board[:]
-        self.root = self.buildTree(board, self.symbol, self.depth)
+        self.game = game
+        if self.engine is not None and self.depth >= 1:
+            if self.time_budget is not None:
+                move = self.engine.deepen(game, True, self.depth - 1, self.time_budget)[1][0]
+            else:
+                move = self.engine.search(game, True, self.depth - 1)[1][0]
+            game.board.track_lines(False) # if evaluate turned it on - so the other player's moves don't pay for it
+            return move
+        self.nodes = {}
+        self.root = self.buildTree(game.board, self.symbol, self.depth)
+        self.nodes = None
+        game.board.track_lines(False)
         return self.pickMove()
 
 # @@@
@@ -1081,41 +2471,54 @@ class MiniMaxDepthGG(MiniMaxGG):
 #Minimax. With depth control.
 class NoahJudahMiniMax:
 
-    def __init__(self, max_depth=None):
+    def __init__(self, max_depth=None, tt=None, alpha_beta=False, time_budget=None):
         self.max_depth = max_depth
-        pass 
+        self.tt = tt #Optional TranspositionTable
+        self.time_budget = time_budget #Seconds per move. Goes one level deeper at a time until time is up
+        #Optional shared alpha-beta engine. The maximizer always plays 'O' here
+        self.engine = AlphaBetaEngine('O', 'X', horizon=self.horizon, tt=tt) if alpha_beta or time_budget is not None else None
+
+    def horizon(self, game, maximizing):
+        return 0 #Out of depth counts as a tie, like level == 0
 
     def determine_move(self, game):
         best_score = float("inf")
         best_move = [] #List of all the best moves
         is_maximizing = None #Decides if we are maximizing or not
-        availableMoves = [] #All moves that are available
         score = 0
 
-        AIsym = game.players[game.checkPlayer()].symbol
+        AIsym = game.to_move()
 
         if AIsym == 'X':
             is_maximizing = True
         else:
             is_maximizing = False
             best_score = -float("inf")
+
+        if self.engine is not None:
+            #X picks the lowest score, O the highest. Ties are all kept so the random pick is the same
+            depth = self.max_depth if self.max_depth is not None else TranspositionTable.FULL_DEPTH
+            if self.time_budget is not None:
+                best_score, best_move = self.engine.deepen(game, AIsym == 'O', depth, self.time_budget, ties='all')
+            else:
+                best_score, best_move = self.engine.search(game, AIsym == 'O', depth, ties='all')
+            return best_move[random.randint(0,len(best_move)-1)]
         
-        for i in range(9):
-            if game.is_valid_move(i):
-                availableMoves.append(i)
-                game.board[i] = AIsym  # Assume 'O' is the AI's symbol
-                score = self.minimax(game, is_maximizing, self.max_depth)
-                game.board[i] = ' '  # Undo move
-                if is_maximizing and best_score >= score:
-                    if score < best_score:
-                        best_move = []
-                    best_score = score
-                    best_move.append(i)
-                if not is_maximizing and best_score <= score:
-                    if best_score < score:
-                        best_move = []
-                    best_score = score
-                    best_move.append(i)
+        availableMoves = game.legal_moves()
+        for i in availableMoves:
+            game.push(i, AIsym)  # Assume 'O' is the AI's symbol
+            score = self.minimax(game, is_maximizing, self.max_depth)
+            game.pop()  # Undo move
+            if is_maximizing and best_score >= score:
+                if score < best_score:
+                    best_move = []
+                best_score = score
+                best_move.append(i)
+            if not is_maximizing and best_score <= score:
+                if best_score < score:
+                    best_move = []
+                best_score = score
+                best_move.append(i)
 
 
         if len(best_move) == 0:
@@ -1134,39 +2537,1804 @@ class NoahJudahMiniMax:
                 return 0  # Tie
             if (level == 0):
                 return 0
-        
-        p = game.players[game.checkPlayer()].symbol
-        
+
+        tt_key = None
+        if self.tt is not None: #Reuse a score we already worked out for this position
+            tt_key = self.tt.key(game.board, is_maximizing, level)
+            entry = self.tt.probe(tt_key)
+            if entry is not None and entry[1] == TranspositionTable.EXACT:
+                return entry[0]
+
         if is_maximizing:
             best_score = -float("inf")
-            for i in range(9):
-                if game.is_valid_move(i):
-                    game.board[i] = 'O'  # Opponent's symbol
-                    score = self.minimax(game, False, level-1)
-                    game.board[i] = ' '  # Undo move
-                    best_score = max(score, best_score)
-
-            return best_score
+            for i in game.legal_moves():
+                game.push(i, 'O')  # Opponent's symbol
+                score = self.minimax(game, False, level-1)
+                game.pop()  # Undo move
+                best_score = max(score, best_score)
 
         if not is_maximizing:
             best_score = float("inf")
-            for i in range(9):
-                if game.is_valid_move(i):
-                    game.board[i] = 'X'  # AI's symbol
-                    score = self.minimax(game, True, level-1)
-                    game.board[i] = ' '  # Undo move
-                    best_score = min(score, best_score)
-                    #print(best_score,p,i)
-            
-            return best_score
+            for i in game.legal_moves():
+                game.push(i, 'X')  # AI's symbol
+                score = self.minimax(game, True, level-1)
+                game.pop()  # Undo move
+                best_score = min(score, best_score)
+
+        if tt_key is not None:
+            self.tt.store(tt_key, best_score, TranspositionTable.EXACT, level)
+        return best_score
+
 
 
+#-------------------------------- Monte Carlo tree search ----------------------
+# Plays random games from the position and grows a tree towards the moves that
+# win most often, picking which branch to try next with UCT (average score plus
+# an exploration bonus for branches tried less).  It gets stronger the more
+# playouts it's given, so strength is set by a playout count or a time budget
+# rather than a depth - that still works on boards too big for minimax to see
+# to the end.
+#
+# Playouts only use the bitmasks: the empty squares are shuffled once and
+# played in turn, and only the lines through each new square are checked, so a
+# playout never touches the list board or check_win.  Each new leaf gets a
+# batch of playouts at once.  The tree is kept between moves of a game and
+# picked up again after the opponent's reply if that reply was explored.
+MCTS_EXPLORATION = 1.4  # UCT constant, about sqrt(2) for scores between 0 and 1
+
+class MCTSNode:
+    __slots__ = ('x_bits', 'o_bits', 'to_move', 'move', 'result', 'untried', 'children', 'visits', 'score')
+
+    # score adds up playout results for the player who just moved here: 1 win, 0.5 tie, 0 loss
+    def __init__(self, x_bits, o_bits, to_move, geometry, move=None):
+        self.x_bits = x_bits
+        self.o_bits = o_bits
+        self.to_move = to_move
+        self.move = move
+        self.result = None  # game over here: 1.0 the player who just moved won, 0.5 tie
+        if move is not None:
+            mask = o_bits if to_move == 'X' else x_bits
+            if WIN_TABLE[mask] if geometry is CLASSIC else geometry.completes(mask, move):
+                self.result = 1.0
+        filled = x_bits | o_bits
+        if self.result is None and filled == geometry.full_mask:
+            self.result = 0.5
+        self.untried = [] if self.result is not None else [square for square in range(geometry.squares)
+                                                          if not filled >> square & 1]
+        random.shuffle(self.untried)
+        self.children = []
+        self.visits = 0
+        self.score = 0.0
+
+    def expand(self, geometry):
+        move = self.untried.pop()
+        bit = 1 << move
+        if self.to_move == 'X':
+            child = MCTSNode(self.x_bits | bit, self.o_bits, 'O', geometry, move)
+        else:
+            child = MCTSNode(self.x_bits, self.o_bits | bit, 'X', geometry, move)
+        self.children.append(child)
+        return child
+
+    def select(self):
+        log_visits = math.log(self.visits)
+        best_child = None
+        best_value = -1.0
+        for child in self.children:
+            value = child.score / child.visits + MCTS_EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+        return best_child
+
+# Plays count random games from the node and returns the total score for the
+# player who just moved there (1 win, 0.5 tie, 0 loss)
+def random_playouts(node, geometry, count):
+    if node.to_move == 'X':
+        mover, other = node.x_bits, node.o_bits
+    else:
+        mover, other = node.o_bits, node.x_bits
+    filled = mover | other
+    empty = [square for square in range(geometry.squares) if not filled >> square & 1]
+    classic = geometry is CLASSIC
+    shuffle = random.shuffle
+    total = 0.0
+    for _ in range(count):
+        shuffle(empty)
+        mine, theirs = mover, other
+        result = 0.5
+        for turn, square in enumerate(empty):
+            if turn & 1:
+                theirs |= 1 << square
+                if WIN_TABLE[theirs] if classic else geometry.completes(theirs, square):
+                    result = 1.0
+                    break
+            else:
+                mine |= 1 << square
+                if WIN_TABLE[mine] if classic else geometry.completes(mine, square):
+                    result = 0.0
+                    break
+        total += result
+    return total
 
+class MCTS:
+    def __init__(self, symbol, playouts=2000, time_budget=None, batch=8, reuse_tree=True):
+        self.symbol = symbol
+        self.playouts = playouts  # per move, ignored if time_budget is set
+        self.time_budget = time_budget  # seconds per move
+        self.batch = batch  # playouts run from each new leaf
+        self.reuse_tree = reuse_tree
+        self.root = None  # the tree after our last move
+        self.stats = None  # optional SearchStats
+        self.playouts_done = 0
+        self.playouts_per_second = 0
+
+    # The node for this position if it's the opponent's reply to our last move, else a new tree
+    def find_root(self, board):
+        if self.reuse_tree and self.root is not None:
+            for reply in self.root.children:
+                if reply.x_bits == board.x_bits and reply.o_bits == board.o_bits:
+                    return reply
+        return MCTSNode(board.x_bits, board.o_bits, self.symbol, board.geometry)
+
+    def determine_move(self, game):
+        geometry = game.board.geometry
+        root = self.find_root(game.board)
+        stats = self.stats
+        batch = self.batch
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+        playouts = 0
+
+        while True:
+            if deadline is not None:
+                if playouts and time.perf_counter() >= deadline:
+                    break
+            elif playouts >= self.playouts:
+                break
+
+            # walk down the fully expanded part of the tree, then add one node
+            node = root
+            path = [root]
+            while node.result is None and not node.untried:
+                node = node.select()
+                path.append(node)
+            if node.result is None:
+                node = node.expand(geometry)
+                path.append(node)
+                if stats is not None:
+                    stats.node(len(path) - 2)
+
+            if node.result is not None:  # game over here, counts as one playout
+                visits, score = 1, node.result
+            else:
+                visits, score = batch, random_playouts(node, geometry, batch)
+            playouts += visits
+            if stats is not None:
+                stats.leaf(node.result is not None)
+
+            # each level scores for the player who moved into it
+            for node in reversed(path):
+                node.visits += visits
+                node.score += score
+                score = visits - score
+
+        elapsed = time.perf_counter() - start
+        self.playouts_done = playouts
+        self.playouts_per_second = playouts / elapsed if elapsed > 0 else 0
+
+        best = max(root.children, key=lambda child: child.visits)  # most visited = most trusted
+        self.root = best if self.reuse_tree else None
+        debug_print_on(f"Playouts: {playouts}  root visits: {root.visits}  per second: {self.playouts_per_second:.0f}")
+        debug_print_on(f"Best move {best.move} scores {best.score / best.visits:.3f} over {best.visits} visits")
+        return best.move
+
+
+#-------------------------------- Game log ----------------------
+# Every game can be recorded as one 8-byte record, so ten million games is
+# 80 MB.  The file is:
+#   GAME_LOG_MAGIC, then a table of GAME_LOG_NAMES strategy names (32 bytes
+#   each, UTF-8, zero padded), then the records as little-endian uint64s:
+#     bits  0-35  moves, 4 bits each, first move in the lowest bits
+#     bits 36-39  number of moves
+#     bits 40-41  result: 0 tie, 1 player 1 won, 2 player 2 won (like wins[])
+#     bit  42     1 if player 1 (who moves first) played O
+#     bits 48-55  player 1's strategy number in the name table
+#     bits 56-63  player 2's strategy number
+# Only 3x3 games fit in a record.  The writer buffers records and only goes
+# back to the name table when a strategy it hasn't seen before turns up.
+GAME_LOG_MAGIC = b"TTTLOG01"
+GAME_LOG_NAMES = 256
+GAME_LOG_NAME_SIZE = 32
+GAME_LOG_HEADER = len(GAME_LOG_MAGIC) + GAME_LOG_NAMES * GAME_LOG_NAME_SIZE
+GAME_LOG_BUFFER = 8192  # records held before writing
+
+def pack_game(moves, result, first_is_o, id1=0, id2=0):
+    record = len(moves) << 36 | result << 40 | int(first_is_o) << 42 | id1 << 48 | id2 << 56
+    for number, move in enumerate(moves):
+        record |= move << (4 * number)
+    return record
+
+# Name a player is logged under
+def player_name(player):
+    return type(player.strategy).__name__ if isinstance(player, AIPlayer) else type(player).__name__
+
+class GameLogWriter:
+    # path=None just collects the records in memory (used by worker processes)
+    def __init__(self, path=None):
+        self.path = path
+        self.names = []
+        self.records = array('Q')
+        self.games = 0
+        self.file = None
+        if path is not None:
+            self.file = open(path, 'wb')
+            self.file.write(GAME_LOG_MAGIC + bytes(GAME_LOG_NAMES * GAME_LOG_NAME_SIZE))
+
+    def strategy_id(self, name):
+        if name not in self.names:
+            if len(self.names) == GAME_LOG_NAMES:
+                raise ValueError(f"a game log only holds {GAME_LOG_NAMES} strategy names")
+            self.names.append(name)
+            if self.file is not None:
+                self.flush()
+                self.file.seek(len(GAME_LOG_MAGIC) + (len(self.names) - 1) * GAME_LOG_NAME_SIZE)
+                self.file.write(name.encode()[:GAME_LOG_NAME_SIZE].ljust(GAME_LOG_NAME_SIZE, b"\0"))
+                self.file.seek(0, os.SEEK_END)
+        return self.names.index(name)
+
+    # result as in wins[]: 0 tie, 1 player 1 won, 2 player 2 won
+    def add(self, game, result):
+        if len(game.board) != 9:
+            raise ValueError("the game log only records 3x3 games")
+        player1, player2 = game.players
+        id1 = self.strategy_id(player_name(player1))
+        id2 = self.strategy_id(player_name(player2))
+        self.records.append(pack_game(game.moves, result, player1.symbol == 'O', id1, id2))
+        self.games += 1
+        if self.file is not None and len(self.records) >= GAME_LOG_BUFFER:
+            self.flush()
+
+    # Records collected by another writer (a worker's), with its names
+    def add_records(self, names, records):
+        ids = [self.strategy_id(name) for name in names]
+        if ids != list(range(len(names))):  # renumber the strategies
+            records = array('Q', (record & 0xFFFFFFFFFFFF | ids[record >> 48 & 0xFF] << 48 | ids[record >> 56] << 56
+                                  for record in records))
+        self.records.extend(records)
+        self.games += len(records)
+        if self.file is not None and len(self.records) >= GAME_LOG_BUFFER:
+            self.flush()
+
+    def flush(self):
+        if self.file is not None and self.records:
+            if sys.byteorder == 'big':
+                self.records.byteswap()
+            self.file.write(self.records.tobytes())
+            self.records = array('Q')
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class GameRecord:
+    __slots__ = ('moves', 'result', 'player1', 'player2', 'player1_symbol')
+
+    def __init__(self, record, names):
+        self.moves = [record >> (4 * number) & 15 for number in range(record >> 36 & 15)]
+        self.result = record >> 40 & 3
+        self.player1 = names[record >> 48 & 0xFF]
+        self.player2 = names[record >> 56]
+        self.player1_symbol = 'O' if record >> 42 & 1 else 'X'
+
+    # The board after each move
+    def boards(self):
+        board = [' '] * 9
+        symbols = (self.player1_symbol, 'X' if self.player1_symbol == 'O' else 'O')
+        for number, move in enumerate(self.moves):
+            board[move] = symbols[number % 2]
+            yield board[:]
+
+    def __repr__(self):
+        result = ('tie', f'{self.player1} won', f'{self.player2} won')[self.result]
+        return f"{self.player1} ({self.player1_symbol}) vs {self.player2}: moves {self.moves}, {result}"
+
+# Memory-maps a game log; games are only decoded as they're read
+class GameLogReader:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(GAME_LOG_MAGIC)] != GAME_LOG_MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not a game log")
+        self.names = []
+        for number in range(GAME_LOG_NAMES):
+            start = len(GAME_LOG_MAGIC) + number * GAME_LOG_NAME_SIZE
+            name = self.map[start:start + GAME_LOG_NAME_SIZE].rstrip(b"\0")
+            if not name:
+                break
+            self.names.append(name.decode())
+
+    def __len__(self):
+        return (len(self.map) - GAME_LOG_HEADER) // 8
+
+    # Raw records, one int per game
+    def records(self):
+        if sys.byteorder == 'little':
+            view = memoryview(self.map)[GAME_LOG_HEADER:GAME_LOG_HEADER + 8 * len(self)].cast('Q')
+            try:
+                yield from view
+            finally:
+                view.release()
+        else:
+            for offset in range(GAME_LOG_HEADER, GAME_LOG_HEADER + 8 * len(self), 8):
+                yield struct.unpack_from('<Q', self.map, offset)[0]
+
+    def __iter__(self):
+        for record in self.records():
+            yield GameRecord(record, self.names)
+
+    # Games matching everything given: result (0/1/2), strategy names, number of moves.
+    # The test is done on the raw records, so games that don't match are never decoded.
+    def find(self, result=None, player1=None, player2=None, moves=None):
+        mask = value = 0
+        if result is not None:
+            mask |= 3 << 40
+            value |= result << 40
+        if moves is not None:
+            mask |= 15 << 36
+            value |= moves << 36
+        for shift, name in ((48, player1), (56, player2)):
+            if name is not None:
+                if name not in self.names:
+                    return
+                mask |= 0xFF << shift
+                value |= self.names.index(name) << shift
+        for record in self.records():
+            if record & mask == value:
+                yield GameRecord(record, self.names)
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# log <file> [tie|player1|player2] [how many to show]
+def log_command(args):
+    results = {'tie': 0, 'player1': 1, 'player2': 2}
+    result = results[args[1]] if len(args) > 1 else None
+    show = int(args[2]) if len(args) > 2 else 5
+    with GameLogReader(args[0]) as log:
+        wins = [0, 0, 0]
+        for record in log.records():
+            wins[record >> 40 & 3] += 1
+        print(f"{len(log)} games, strategies {log.names}")
+        print(f"Player 1: {wins[1]}   Player 2: {wins[2]}   Ties: {wins[0]}")
+        for number, game in enumerate(log.find(result)):
+            if number == show:
+                break
+            print()
+            print(game)
+            for board in game.boards():
+                print(''.join(board).replace(' ', '.'))
+
+
+#-------------------------------- Running many games ----------------------
+# Plays numGames games between two players and returns the tally
+# [ties, player 1 wins, player 2 wins].  log is an optional GameLogWriter.
+def play_games(player1, player2, numGames, first_game=1, log=None):
+    wins = [0,0,0]   # 0 - ties, 1 - p1, 2 - p2
+
+    for currGame in range (first_game, first_game+numGames):
+        game = TicTacToe(player1, player2)
+        print_on(f"Game starting... {currGame} \n")
+        print_on ("#############")
+        winner = game.play()
+
+        #keep count of the number of wins
+        result = 0
+        if winner == "X" and player1.symbol == "X": result = 1
+        if winner == "X" and player2.symbol == "X": result = 2
+
+        if winner == "O" and player1.symbol == "O": result = 1
+        if winner == "O" and player2.symbol == "O": result = 2
+
+        wins[result] = wins[result] + 1
+        if log is not None:
+            log.add(game, result)
+
+        #reset move count to one after each game so the games are not always the same due to starting on same square each game
+        player1.movecount = 1
+        player2.movecount = 1
+
+    return wins
+
+# Games are split into fixed-size shards, each with its own seed, so a run
+# gives the same tally no matter how many processes play it.
+GAMES_PER_SHARD = 500
+
+# Returns (wins, strategy names, game records) - the records are empty unless logging
+def _play_shard(shard):
+    player1, player2, numGames, first_game, seed, logging = shard
+    random.seed(seed)
+    log = GameLogWriter() if logging else None
+    wins = play_games(player1, player2, numGames, first_game, log)
+    return wins, log.names if logging else [], log.records if logging else array('Q')
+
+# Plays the games on a pool of worker processes. Each worker gets its own copy
+# of the players, so strategies must not rely on shared state between games.
+# Game records come back with each shard and are logged in game order.
+def play_games_parallel(player1, player2, numGames, workers=0, seed=0, log=None):
+    workers = workers or os.cpu_count() or 1
+    shards = []
+    for shard, first in enumerate(range(0, numGames, GAMES_PER_SHARD)):
+        shards.append((player1, player2, min(GAMES_PER_SHARD, numGames - first), first + 1, seed * 1000003 + shard,
+                       log is not None))
+
+    wins = [0,0,0]
+    def collect(results):
+        for shard_wins, names, records in results:
+            for i in range(3):
+                wins[i] += shard_wins[i]
+            if log is not None:
+                log.add_records(names, records)
+
+    if workers == 1:
+        collect(map(_play_shard, shards))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            collect(pool.imap(_play_shard, shards))  # in order, as they finish
+    return wins
+
+# Prints games/sec for 1 .. max_workers processes
+def parallel_scaling(player1, player2, numGames, max_workers=0, seed=0):
+    max_workers = max_workers or os.cpu_count() or 1
+    base_rate = None
+    for workers in range(1, max_workers + 1):
+        start_time = time.perf_counter()
+        wins = play_games_parallel(player1, player2, numGames, workers, seed)
+        rate = numGames / (time.perf_counter() - start_time)
+        base_rate = base_rate or rate
+        print(f"{workers:3d} workers: {rate:10.1f} games/sec  ({rate / base_rate:.2f}x)  results {wins}")
+
+
+#-------------------------------- Tournament ----------------------
+# Every strategy the tools can build by name. Each entry makes a fresh strategy
+# for the given symbol.  The minimax entries use the alpha-beta engine and a
+# transposition table - same moves, much faster.  strategy_tt gives them the
+# shared table when the process has attached to one.
+STRATEGIES = {
+    'SimpleAI': lambda symbol: SimpleAI(),
+    'RandomAI': lambda symbol: RandomAI(),
+    'AaronMikeAI': lambda symbol: AaronMikeAI(),
+    'JudahsCoolAI': lambda symbol: JudahsCoolAI(),
+    'DavidAI': lambda symbol: DavidAI(),
+    'Felix_Jessie_AI': lambda symbol: Felix_Jessie_AI(),
+    'MinimaxAI': lambda symbol: MinimaxAI(symbol, tt=strategy_tt('MinimaxAI', symbol), alpha_beta=True),
+    'MinimaxAI_depth_Eval(9)': lambda symbol: MinimaxAI_depth_Eval(symbol, 9, alpha_beta=True, tt=strategy_tt('MinimaxAI_depth_Eval(9)', symbol)),
+    'AaronMikeMinimax': lambda symbol: AaronMikeMinimax(symbol, tt=strategy_tt('AaronMikeMinimax', symbol), alpha_beta=True),
+    'Felix_Jesse_Depth_limit(3)': lambda symbol: Felix_Jesse_Depth_limit(symbol, tt=strategy_tt('Felix_Jesse_Depth_limit(3)', symbol), alpha_beta=True, limit=3),
+    'MiniMaxGG': lambda symbol: MiniMaxGG(symbol, alpha_beta=True),
+    'MiniMaxDepthGG(5)': lambda symbol: MiniMaxDepthGG(symbol, 5, alpha_beta=True),
+    'NoahJudahMiniMax(9)': lambda symbol: NoahJudahMiniMax(9, tt=strategy_tt('NoahJudahMiniMax(9)', symbol), alpha_beta=True),
+    'SolvedTableAI': lambda symbol: SolvedTableAI(symbol),
+    'MCTS(2000)': lambda symbol: MCTS(symbol, 2000),
+}  # LearnedAI is added further down if its table has been trained
+
+# The STRATEGIES that can play on the geometry: SolvedTableAI only knows 3x3
+# and LearnedAI needs a table trained for that board
+def strategies_for(geometry):
+    names = [name for name in STRATEGIES if name != 'SolvedTableAI' or geometry is CLASSIC]
+    if 'LearnedAI' in names and not os.path.exists(learned_table_path(geometry)):
+        names.remove('LearnedAI')
+    return names
+
+def _play_pairing(task):
+    name1, name2, numGames, seed, scheduled = task
+    random.seed(seed)
+    if scheduled:
+        wins, _, _ = play_games_scheduled(batch_strategy(name1, seed=seed), batch_strategy(name2, seed=seed + 1), numGames, seed=seed)
+    else:
+        player1 = AIPlayer('X', STRATEGIES[name1]('X'))
+        player2 = AIPlayer('O', STRATEGIES[name2]('O'))
+        wins = play_games(player1, player2, numGames)
+    return name1, name2, wins, worker_tt_stats()
+
+# Plays every ordered pair of strategies (the first one is X and moves first),
+# by default all of them that can play on BOARD_SIZE / WIN_LENGTH.
+# Returns {(name1, name2): [ties, name1 wins, name2 wins]}.  scheduled plays
+# each pairing's games all at once with the game scheduler.
+# With a shared_tt (a SharedTranspositionTable) the minimax strategies in every
+# worker use it, and tt_stats (a dict) gets each worker's {pid: counts}.
+def run_tournament(names=None, numGames=100, workers=0, seed=0, scheduled=False, shared_tt=None, tt_stats=None):
+    names = names or strategies_for(board_geometry(BOARD_SIZE, min(WIN_LENGTH, BOARD_SIZE)))
+    pairs = [(a, b) for a in names for b in names if a != b]
+    tasks = [(a, b, numGames, seed * 1000003 + i, scheduled) for i, (a, b) in enumerate(pairs)]
+    workers = workers or os.cpu_count() or 1
+    shared_name = shared_tt.name if shared_tt is not None else None
+
+    results = {}
+    def collect(finished):
+        for name1, name2, wins, worker_stats in finished:
+            results[(name1, name2)] = wins
+            if worker_stats is not None and tt_stats is not None:
+                pid, counts = worker_stats  # counts only go up, keep the latest
+                if pid not in tt_stats or counts['hits'] + counts['misses'] > tt_stats[pid]['hits'] + tt_stats[pid]['misses']:
+                    tt_stats[pid] = counts
+
+    if workers == 1:
+        attach_shared_tt(shared_name)
+        try:
+            collect(map(_play_pairing, tasks))
+        finally:
+            attach_shared_tt(None)
+    else:
+        initializer = attach_shared_tt if shared_name is not None else None
+        with multiprocessing.Pool(workers, initializer, (shared_name,)) as pool:
+            collect(pool.imap_unordered(_play_pairing, tasks))
+    return results
+
+# Hit rates of each worker that used the shared transposition table
+def print_tt_stats(tt_stats, slots):
+    print(f"\nSHARED TRANSPOSITION TABLE ({slots} slots)")
+    print(f"{'worker':>8}{'lookups':>12}{'hit rate':>10}{'from others':>13}{'stores':>10}")
+    for pid, counts in sorted(tt_stats.items()):
+        lookups = counts['hits'] + counts['misses']
+        hit_rate = counts['hits'] / lookups if lookups else 0.0
+        from_others = counts['shared_hits'] / counts['hits'] if counts['hits'] else 0.0
+        print(f"{pid:>8}{lookups:>12}{hit_rate:>10.1%}{from_others:>13.1%}{counts['stores']:>10}")
+
+# (wins, draws, losses) of a against b over both colors
+def pair_record(results, a, b):
+    as_x = results.get((a, b), [0, 0, 0])
+    as_o = results.get((b, a), [0, 0, 0])
+    return as_x[1] + as_o[2], as_x[0] + as_o[0], as_x[2] + as_o[1]
+
+# Bradley-Terry strengths fitted with the MM algorithm, draws count as half a win.
+# Every pair also gets one virtual draw so a strategy that never wins still gets
+# a finite rating. Returned on the Elo scale, averaging 0.  Stops once no
+# rating moves by more than tolerance (Elo points) in an iteration.
+def bradley_terry(names, records, tolerance=1e-6, max_iterations=100000):
+    wins = {a: 0.0 for a in names}
+    games = {}
+    for (a, b), (w, d, l) in records.items():
+        wins[a] += w + 0.5 * d + 0.5
+        wins[b] += l + 0.5 * d + 0.5
+        games[(a, b)] = games[(b, a)] = w + d + l + 1
+    strength = {a: 1.0 for a in names}
+    for _ in range(max_iterations):
+        new = {}
+        for a in names:
+            denom = sum(n / (strength[a] + strength[b]) for (x, b), n in games.items() if x == a)
+            new[a] = wins[a] / denom if denom else strength[a]
+        mean_log = sum(math.log(v) for v in new.values()) / len(new)
+        new = {a: v / math.exp(mean_log) for a, v in new.items()}
+        change = max(abs(400 * math.log10(new[a] / strength[a])) for a in names)
+        strength = new
+        if change < tolerance:
+            break
+    return {a: 400 * math.log10(v) for a, v in strength.items()}
+
+# Ratings with bootstrap confidence intervals: {name: (rating, low, high)}
+def tournament_ratings(results, names=None, samples=200, confidence=0.95, seed=0):
+    names = names or sorted({name for pair in results for name in pair})
+    records = {(a, b): pair_record(results, a, b) for a in names for b in names if a < b}
+    ratings = bradley_terry(names, records)
+
+    rng = random.Random(seed)
+    resampled = {a: [] for a in names}
+    for _ in range(samples):
+        sample = {}
+        for pair, (w, d, l) in records.items():
+            n = w + d + l
+            counts = [0, 0, 0]
+            for _ in range(n):
+                r = rng.random() * n
+                counts[0 if r < w else 1 if r < w + d else 2] += 1
+            sample[pair] = tuple(counts)
+        for a, rating in bradley_terry(names, sample).items():
+            resampled[a].append(rating)
+
+    tail = (1 - confidence) / 2
+    intervals = {}
+    for a in names:
+        values = sorted(resampled[a])
+        low = values[int(tail * (len(values) - 1))]
+        high = values[int((1 - tail) * (len(values) - 1))]
+        intervals[a] = (ratings[a], low, high)
+    return intervals
+
+def print_tournament(results, names=None):
+    names = names or sorted({name for pair in results for name in pair})
+    width = max(len(name) for name in names)
+
+    print("\nWIN-DRAW-LOSS (row vs column, both colors)")
+    print(" " * width, *[f"{i:>11}" for i in range(1, len(names) + 1)])
+    for i, a in enumerate(names, 1):
+        cells = []
+        for b in names:
+            cells.append(f"{'-':>11}" if a == b else f"{'%d-%d-%d' % pair_record(results, a, b):>11}")
+        print(f"{a:<{width}}", *cells, f"  ({i})")
+
+    print("\nRATINGS (Bradley-Terry, Elo scale, 95% bootstrap interval)")
+    ratings = tournament_ratings(results, names)
+    for a in sorted(names, key=lambda a: -ratings[a][0]):
+        rating, low, high = ratings[a]
+        print(f"{a:<{width}} {rating:8.1f}   [{low:8.1f}, {high:8.1f}]")
+
+def tournament_command(args):
+    scheduled = '--scheduled' in args
+    shared = '--shared-tt' in args
+    args = [arg for arg in args if not arg.startswith('--')]
+    numGames = int(args[0]) if args else 100
+    start_time = time.perf_counter()
+    shared_tt = SharedTranspositionTable() if shared else None
+    tt_stats = {}
+    try:
+        results = run_tournament(numGames=numGames, workers=NUM_WORKERS, scheduled=scheduled, shared_tt=shared_tt, tt_stats=tt_stats)
+    finally:
+        if shared_tt is not None:
+            shared_tt.close()
+    print_tournament(results)
+    if shared:
+        print_tt_stats(tt_stats, shared_tt.slots)
+    print(f"\n{len(results)} pairings x {numGames} games in {time.perf_counter() - start_time:.1f} seconds")
+
+#-------------------------------- Weight tuning ----------------------
+# Searches for better GG_WEIGHTS.  Each candidate set plays MiniMaxDepthGG
+# against the opponents below, as X and as O, scored 1 for a win and 1/2 for a
+# draw.  The games are played in rounds on a process pool, and after each round
+# any candidate whose score is surely below the leader's (Hoeffding bounds,
+# TUNE_CONFIDENCE over all the comparisons) stops playing, so the games go to
+# the close ones.  Every candidate plays the same seeds in a round, so luck of
+# the draw mostly cancels out between them.
+TUNE_OPPONENTS = {
+    'MinimaxAI_depth_Eval(2)': lambda symbol: MinimaxAI_depth_Eval(symbol, 2, alpha_beta=True),
+    'JudahsCoolAI': lambda symbol: JudahsCoolAI(),
+    'RandomAI': lambda symbol: RandomAI(),
+}
+TUNE_DEPTH = 2          # how deep the candidates search
+TUNE_ROUNDS = 10        # rounds of games for each candidate (fewer if it's dropped)
+TUNE_CONFIDENCE = 0.99
+TUNE_GRID = {'win_threat': [25, 50, 100], 'opponent_fork': [5, 10, 20], 'center': [1, 3, 5]}
+TUNE_POPULATION = 16    # candidates per generation for 'evolve'
+
+# One round for one candidate: games as X and as O against each opponent.
+# Returns {opponent: [won, drawn, lost]}
+def _tune_round(task):
+    weights, numGames, seed = task
+    record = {}
+    for i, (name, opponent) in enumerate(TUNE_OPPONENTS.items()):
+        random.seed(seed * 31 + i)
+        candidate = AIPlayer('X', MiniMaxDepthGG('X', TUNE_DEPTH, alpha_beta=True, weights=weights))
+        ties, won, lost = play_games(candidate, AIPlayer('O', opponent('O')), numGames)
+        candidate = AIPlayer('O', MiniMaxDepthGG('O', TUNE_DEPTH, alpha_beta=True, weights=weights))
+        o_ties, o_lost, o_won = play_games(AIPlayer('X', opponent('X')), candidate, numGames)
+        record[name] = [won + o_won, ties + o_ties, lost + o_lost]
+    return record
+
+def tune_score(record):
+    won = sum(r[0] for r in record.values())
+    drawn = sum(r[1] for r in record.values())
+    games = won + drawn + sum(r[2] for r in record.values())
+    return (won + 0.5 * drawn) / games if games else 0.0, games
+
+# Plays the candidates (full weight dicts) round by round, dropping the ones
+# that are clearly worse (pool: a multiprocessing.Pool to play them on).
+# Returns [(score, games, weights, record), ...] best first.
+def evaluate_candidates(candidates, numGames=10, rounds=TUNE_ROUNDS, seed=0, pool=None):
+    records = [{name: [0, 0, 0] for name in TUNE_OPPONENTS} for _ in candidates]
+    alive = list(range(len(candidates)))
+    delta = (1 - TUNE_CONFIDENCE) / (len(candidates) * rounds)
+    for round in range(rounds):
+        tasks = [(candidates[i], numGames, seed * 1000003 + round) for i in alive]
+        results = pool.map(_tune_round, tasks) if pool else map(_tune_round, tasks)
+        for i, result in zip(alive, results):
+            for name, (w, d, l) in result.items():
+                records[i][name][0] += w
+                records[i][name][1] += d
+                records[i][name][2] += l
+        if len(alive) > 1:
+            scores = {i: tune_score(records[i]) for i in alive}
+            margin = math.sqrt(math.log(2 / delta) / (2 * scores[alive[0]][1]))  # everyone alive has played as many
+            best = max(score for score, games in scores.values())
+            alive = [i for i in alive if scores[i][0] + margin >= best - margin]
+    ranked = []
+    for i, weights in enumerate(candidates):
+        score, games = tune_score(records[i])
+        ranked.append((score, games, weights, records[i]))
+    ranked.sort(key=lambda entry: (-entry[1], -entry[0]))  # the ones that played every round first
+    return ranked
+
+def grid_candidates():
+    names = list(TUNE_GRID)
+    return [{**GG_WEIGHTS, **dict(zip(names, values))} for values in itertools.product(*TUNE_GRID.values())]
+
+# count random weight sets, each weight anywhere from 0 to twice the default
+def random_candidates(count, rng):
+    return [{name: round(rng.uniform(0, 2 * value), 1) for name, value in GG_WEIGHTS.items()} for _ in range(count)]
+
+# Each weight scaled by about +-30%
+def mutate_weights(weights, rng):
+    return {name: round(value * math.exp(rng.gauss(0, 0.3)), 1) for name, value in weights.items()}
+
+def tune_command(args):
+    mode = args[0] if args else 'random'
+    count = int(args[1]) if len(args) > 1 else (5 if mode == 'evolve' else 16)
+    numGames = int(args[2]) if len(args) > 2 else 10
+    rng = random.Random(0)
+    workers = NUM_WORKERS or os.cpu_count() or 1
+    start_time = time.perf_counter()
+
+    with multiprocessing.Pool(workers) as pool:
+        if mode == 'grid':
+            candidates = grid_candidates()
+        elif mode == 'random':
+            candidates = random_candidates(count, rng)
+        elif mode == 'evolve':
+            candidates = random_candidates(TUNE_POPULATION - 1, rng)
+        else:
+            print(f"Unknown search {mode!r} - use grid, random or evolve")
+            return
+        if GG_WEIGHTS not in candidates:
+            candidates.insert(0, dict(GG_WEIGHTS))  # the defaults are always in the running
+
+        generations = count if mode == 'evolve' else 1
+        for generation in range(generations):
+            ranked = evaluate_candidates(candidates, numGames, seed=generation, pool=pool)
+            if mode == 'evolve':
+                print(f"generation {generation + 1}: best {ranked[0][0]:.3f} over {ranked[0][1]} games")
+                elite = [weights for score, games, weights, record in ranked[:TUNE_POPULATION // 4]]
+                candidates = elite + [mutate_weights(rng.choice(elite), rng) for _ in range(TUNE_POPULATION - len(elite))]
+
+    print(f"\n{len(ranked)} candidates, {sum(entry[1] for entry in ranked)} games in {time.perf_counter() - start_time:.1f} seconds")
+    print("\nSCORE   GAMES  WEIGHTS")
+    for score, games, weights, record in ranked[:5]:
+        changed = {name: value for name, value in weights.items() if value != GG_WEIGHTS[name]}
+        print(f"{score:.3f} {games:7d}  {changed or 'defaults'}")
+
+    score, games, weights, record = ranked[0]
+    print(f"\nBest weights (MiniMaxDepthGG(symbol, depth, weights=...)):\n{json.dumps(weights)}")
+    for name, (w, d, l) in record.items():
+        print(f"  vs {name:<24} won {w:5d}  drawn {d:5d}  lost {l:5d}")
+
+#-------------------------------- Strategy audit ----------------------
+# Asks strategies for their move at every position of a normal game (X moves
+# first) that isn't over yet - 4520 of them - and checks each move against the
+# solved game.  A blunder is a move that gives away a win or a draw the
+# position still had.  The positions are dealt out in shards to a process pool,
+# and each shard builds its own strategies.
+AUDIT_PHASES = [('opening', 0, 2), ('midgame', 3, 5), ('endgame', 6, 8)]  # by squares already filled
+AUDIT_SKIP = {'MCTS(2000)'}  # too slow to ask 4520 times - name it on the command line to include it
+AUDIT_SHARDS = 32
+
+# [(x_bits, o_bits), ...] for every position X-first games reach before they're
+# over, and solve_all_positions() for the values
+def audit_positions():
+    solved = solve_all_positions()
+    positions = []
+    for x_bits, o_bits, mover in solved:
+        ahead = bin(x_bits).count('1') - bin(o_bits).count('1')
+        if ahead == mover:  # X to move with the counts even, O with X one ahead
+            positions.append((x_bits, o_bits))
+    positions.sort()
+    return positions, solved
+
+# Value of the move for the side to move (1 win, 0 draw, -1 loss, best play
+# after it), None if the square isn't empty
+def audit_move_value(solved, x_bits, o_bits, move):
+    if type(move) is not int or not 0 <= move < 9 or (x_bits | o_bits) & BIT[move]:
+        return None
+    mover = bin(x_bits).count('1') - bin(o_bits).count('1')
+    mine, theirs = (x_bits, o_bits) if mover == 0 else (o_bits, x_bits)
+    after = mine | BIT[move]
+    if WIN_TABLE[after]:
+        return 1
+    if after | theirs == FULL_MASK:
+        return 0
+    return -solved[(after, o_bits, 1) if mover == 0 else (x_bits, after, 0)][0]
+
+# Moves for one shard of positions: {name: {(x_bits, o_bits): move}}.  Each
+# strategy gets the whole shard in one determine_moves call (see Batch moves).
+def _audit_shard(task):
+    names, positions, seed = task
+    random.seed(seed)
+    x_bits = [x for x, o in positions]
+    o_bits = [o for x, o in positions]
+    symbols = ['X' if bin(x).count('1') == bin(o).count('1') else 'O' for x, o in positions]
+    moves = {}
+    with contextlib.redirect_stdout(io.StringIO()):  # some strategies print as they think
+        for name in names:
+            picked = batch_strategy(name, seed=seed).determine_moves(x_bits, o_bits, symbols)
+            moves[name] = {position: move if type(move) is int or move is None else int(move)
+                           for position, move in zip(positions, picked)}
+    return moves
+
+# Returns (positions, solved, {name: {(x_bits, o_bits): move}})
+def run_audit(names=None, workers=0, seed=0):
+    names = names or [name for name in STRATEGIES if name not in AUDIT_SKIP]
+    positions, solved = audit_positions()
+    tasks = [(names, positions[shard::AUDIT_SHARDS], seed * 1000003 + shard) for shard in range(AUDIT_SHARDS)]
+    workers = workers or os.cpu_count() or 1
+
+    moves = {name: {} for name in names}
+    if workers == 1:
+        results = map(_audit_shard, tasks)
+        for shard_moves in results:
+            for name, picked in shard_moves.items():
+                moves[name].update(picked)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for shard_moves in pool.imap_unordered(_audit_shard, tasks):
+                for name, picked in shard_moves.items():
+                    moves[name].update(picked)
+    return positions, solved, moves
+
+# {name: {phase: [positions, blunders, invalid moves]}}, phase 'all' for the total
+def audit_blunders(positions, solved, moves):
+    report = {}
+    for name, picked in moves.items():
+        counts = report[name] = {phase: [0, 0, 0] for phase, _, _ in AUDIT_PHASES + [('all', 0, 8)]}
+        for x_bits, o_bits in positions:
+            filled = bin(x_bits | o_bits).count('1')
+            mover = filled & 1
+            value = audit_move_value(solved, x_bits, o_bits, picked[(x_bits, o_bits)])
+            best = solved[(x_bits, o_bits, mover)][0]
+            for phase, low, high in AUDIT_PHASES + [('all', 0, 8)]:
+                if low <= filled <= high:
+                    counts[phase][0] += 1
+                    if value is None:
+                        counts[phase][2] += 1
+                    elif value < best:
+                        counts[phase][1] += 1
+    return report
+
+# [(x_bits, o_bits, move a, value a, move b, value b), ...] where a and b pick different squares
+def audit_disagreements(positions, solved, moves, a, b):
+    found = []
+    for x_bits, o_bits in positions:
+        move_a, move_b = moves[a][(x_bits, o_bits)], moves[b][(x_bits, o_bits)]
+        if move_a != move_b:
+            found.append((x_bits, o_bits, move_a, audit_move_value(solved, x_bits, o_bits, move_a),
+                          move_b, audit_move_value(solved, x_bits, o_bits, move_b)))
+    return found
+
+def print_audit(positions, solved, moves, list_limit=20):
+    names = list(moves)
+    width = max(len(name) for name in names)
+    report = audit_blunders(positions, solved, moves)
+
+    print("\nBLUNDERS (moves that give away a win or a draw) by squares filled")
+    print(" " * width, *[f"{f'{phase} {low}-{high}':>16}" for phase, low, high in AUDIT_PHASES], f"{'all':>16}", "  invalid")
+    for name in sorted(names, key=lambda name: report[name]['all'][1] + report[name]['all'][2]):
+        cells = []
+        for phase in [phase for phase, _, _ in AUDIT_PHASES] + ['all']:
+            count, blunders, invalid = report[name][phase]
+            cells.append(f"{blunders:5d} {100 * blunders / count:5.1f}%".rjust(16))
+        print(f"{name:<{width}}", *cells, f"{report[name]['all'][2]:9d}")
+
+    print("\nDISAGREEMENTS (positions where row and column pick different squares)")
+    print(" " * width, *[f"{i:>6}" for i in range(1, len(names) + 1)])
+    for i, a in enumerate(names, 1):
+        cells = [f"{'-':>6}" if a == b else f"{len(audit_disagreements(positions, solved, moves, a, b)):6d}" for b in names]
+        print(f"{a:<{width}}", *cells, f"  ({i})")
+
+    # with two strategies, show where they differ - the moves that lose value first
+    if len(names) == 2:
+        found = audit_disagreements(positions, solved, moves, *names)
+        found.sort(key=lambda entry: min(value if value is not None else -2 for value in entry[3::2]))
+        print(f"\n{len(found)} positions where {names[0]} and {names[1]} differ (value 1 win, 0 draw, -1 loss):")
+        for x_bits, o_bits, move_a, value_a, move_b, value_b in found[:list_limit]:
+            board = ''.join('X' if x_bits >> i & 1 else 'O' if o_bits >> i & 1 else '.' for i in range(9))
+            print(f"  {board}  {names[0]}: {move_a} ({value_a})  {names[1]}: {move_b} ({value_b})")
+
+def audit_command(args):
+    names = args or None
+    start_time = time.perf_counter()
+    positions, solved, moves = run_audit(names, workers=NUM_WORKERS)
+    print_audit(positions, solved, moves)
+    print(f"\n{len(moves)} strategies x {len(positions)} positions in {time.perf_counter() - start_time:.1f} seconds")
+
+#-------------------------------- Batch simulator ----------------------
+# Plays thousands of games at once with NumPy. The games are two arrays of
+# 9-bit masks, one for X and one for O (the same masks BitBoard keeps), and each
+# ply all unfinished games move together.  Win checks, "which squares win"
+# and "pick a random open square" are all table lookups on the masks.
+# The heuristic strategies below are vectorized copies of the classes above -
+# same rules in the same order, random picks drawn from the same choices - so
+# the tallies match play_games up to sampling noise.  Needs NumPy.
+CENTER_MASK = BIT[4]
+CORNER_MASK = BIT[0] | BIT[2] | BIT[6] | BIT[8]
+_batch_tables_cache = None
+
+def _batch_tables():
+    global _batch_tables_cache
+    if _batch_tables_cache is None:
+        masks = range(FULL_MASK + 1)
+        win = np.array(WIN_TABLE, dtype=bool)
+        # squares that would complete a line for a player owning mask
+        wins_if = np.array([sum(BIT[i] for i in range(9) if WIN_TABLE[mask | BIT[i]] and not mask & BIT[i]) for mask in masks], dtype=np.uint16)
+        lowest_move = np.array([(mask & -mask).bit_length() - 1 for mask in masks], dtype=np.intp)
+        popcount = np.array([bin(mask).count('1') for mask in masks], dtype=np.intp)
+        # nth_bit[mask, n] = the n-th lowest bit of mask
+        nth_bit = np.zeros((FULL_MASK + 1, 9), dtype=np.uint16)
+        for mask in masks:
+            bits = [BIT[i] for i in range(9) if mask & BIT[i]]
+            nth_bit[mask, :len(bits)] = bits
+        _batch_tables_cache = (win, wins_if, lowest_move, popcount, nth_bit)
+    return _batch_tables_cache
+
+# Per game: mask of the open squares where the owner of mine would complete a line
+def batch_completes(mine, theirs):
+    wins_if = _batch_tables()[1]
+    return wins_if[mine] & ~(mine | theirs)
+
+# Per game: one random bit of mask (0 where mask is 0)
+def batch_random_bit(mask, rng):
+    _, _, _, popcount, nth_bit = _batch_tables()
+    pick = (rng.random(len(mask)) * popcount[mask]).astype(np.intp)
+    return nth_bit[mask, pick]
+
+# Per game: the lowest square of the first non-empty rule mask
+def _batch_first_rule(*rules):
+    chosen = rules[-1]
+    for rule in reversed(rules[:-1]):
+        chosen = np.where(rule != 0, rule, chosen)
+    return _batch_tables()[2][chosen]
+
+def batch_simple_ai(x_bits, o_bits, rng):
+    # win as 'X', block 'O', then the first open square
+    empty = ~(x_bits | o_bits) & FULL_MASK
+    return _batch_first_rule(batch_completes(x_bits, o_bits), batch_completes(o_bits, x_bits), empty)
+
+def batch_random_ai(x_bits, o_bits, rng):
+    empty = ~(x_bits | o_bits) & FULL_MASK
+    return _batch_first_rule(batch_random_bit(empty, rng))
+
+def batch_aaron_mike_ai(x_bits, o_bits, rng):
+    # win as 'O', block 'X', center, first open corner, random
+    empty = ~(x_bits | o_bits) & FULL_MASK
+    return _batch_first_rule(batch_completes(o_bits, x_bits), batch_completes(x_bits, o_bits), empty & CENTER_MASK,
+                             empty & CORNER_MASK, batch_random_bit(empty, rng))
+
+def batch_judahs_cool_ai(x_bits, o_bits, rng):
+    # center, win as 'O', win as 'X', random corner, random
+    empty = ~(x_bits | o_bits) & FULL_MASK
+    return _batch_first_rule(empty & CENTER_MASK, batch_completes(o_bits, x_bits), batch_completes(x_bits, o_bits),
+                             batch_random_bit(empty & CORNER_MASK, rng), batch_random_bit(empty, rng))
+
+BATCH_STRATEGIES = {
+    SimpleAI: batch_simple_ai,
+    RandomAI: batch_random_ai,
+    AaronMikeAI: batch_aaron_mike_ai,
+    JudahsCoolAI: batch_judahs_cool_ai,
+}
+
+# numGames games between two batch strategies, player 1 moving first with a
+# random square like AIPlayer does. Returns [ties, player 1 wins, player 2 wins].
+def batch_simulate(strategy1, strategy2, numGames, symbol1='X', seed=None, chunk=200000):
+    if np is None:
+        raise ImportError("batch_simulate needs NumPy (pip install numpy)")
+    if BOARD_SIZE != 3:
+        raise ValueError("batch_simulate only plays the 3x3 game")
+    rng = np.random.default_rng(seed)
+    win = _batch_tables()[0]
+    strategies = (strategy1, strategy2)
+    x_moves_on = 0 if symbol1 == 'X' else 1  # turn (0 = player 1) that plays X
+    wins = [0, 0, 0]
+
+    for start in range(0, numGames, chunk):
+        n = min(chunk, numGames - start)
+        x_bits = np.zeros(n, dtype=np.uint16)
+        o_bits = np.zeros(n, dtype=np.uint16)
+        for ply in range(9):
+            turn = ply % 2
+            if ply == 0:
+                moves = rng.integers(0, 9, size=n)  # P1's first move is random
+            else:
+                moves = strategies[turn](x_bits, o_bits, rng)
+            bits = np.left_shift(1, moves).astype(np.uint16)
+            if turn == x_moves_on:
+                x_bits |= bits
+                won = win[x_bits]
+            else:
+                o_bits |= bits
+                won = win[o_bits]
+
+            wins[1 + turn] += int(won.sum())
+            x_bits, o_bits = x_bits[~won], o_bits[~won]  # keep only unfinished games
+            n = len(x_bits)
+            if n == 0:
+                break
+        wins[0] += n  # still going after 9 moves = tie
+    return wins
+
+# Same as play_games(player1, player2, numGames) for AIPlayers whose strategies have batch versions
+def batch_play_games(player1, player2, numGames, seed=None):
+    strategy1 = BATCH_STRATEGIES[type(player1.strategy)]
+    strategy2 = BATCH_STRATEGIES[type(player2.strategy)]
+    return batch_simulate(strategy1, strategy2, numGames, player1.symbol, seed)
+
+def simulate_command(args):
+    numGames = int(args[0]) if args else 1000000
+    name1 = args[1] if len(args) > 1 else 'SimpleAI'
+    name2 = args[2] if len(args) > 2 else 'RandomAI'
+    player1 = AIPlayer('X', STRATEGIES[name1]('X'))
+    player2 = AIPlayer('O', STRATEGIES[name2]('O'))
+    start_time = time.perf_counter()
+    wins = batch_play_games(player1, player2, numGames)
+    elapsed = time.perf_counter() - start_time
+    print(f"{numGames} games in {elapsed:.2f} seconds ({numGames / elapsed:.0f} games/sec)")
+    print(f"Player 1 ({name1}): {wins[1]}   Player 2 ({name2}): {wins[2]}   Ties: {wins[0]}")
+
+#-------------------------------- Batch moves ----------------------
+# A second, optional way to ask a strategy for moves - many positions per call:
+#   strategy.determine_moves(x_bits, o_bits, symbols) -> one square per position
+# x_bits and o_bits are sequences (or NumPy arrays) of 3x3 masks like BitBoard's
+# and symbols is the side to move in each ('X' or 'O', or one symbol for all).
+# Nothing outside the call is written to - there's no game object to change.
+# SolvedTableAI and LearnedAI have their own vectorized versions; for the
+# other strategies batch_strategy() hands back the NumPy copies from the batch
+# simulator, or LegacyBatch, which asks determine_move one position at a time
+# on a game of its own.
+_batch_index_cache = None
+
+# Base-3 position indexes (see board_index) for arrays of masks
+def batch_index(x_bits, o_bits):
+    global _batch_index_cache
+    if _batch_index_cache is None:
+        _batch_index_cache = np.array([sum(POW3[i] for i in range(9) if mask & BIT[i]) for mask in range(FULL_MASK + 1)],
+                                      dtype=np.intp)
+    return _batch_index_cache[x_bits] + 2 * _batch_index_cache[o_bits]
+
+# 1 where O is to move, 0 for X
+def batch_is_o(symbols, n):
+    if isinstance(symbols, str):
+        return np.full(n, int(symbols == 'O'), dtype=np.intp)
+    return np.array([symbol == 'O' for symbol in symbols], dtype=np.intp)
+
+# A batch simulator function (BATCH_STRATEGIES) as a batch strategy.  Like the
+# classes they copy, they play the same whichever side is to move.
+class VectorizedBatch:
+    def __init__(self, function, seed=None, deterministic=False):
+        self.function = function
+        self.rng = np.random.default_rng(seed)
+        self.deterministic = deterministic
+
+    def determine_moves(self, x_bits, o_bits, symbols):
+        return self.function(np.asarray(x_bits, dtype=np.uint16), np.asarray(o_bits, dtype=np.uint16), self.rng)
+
+# Any strategy as a batch strategy.  make_strategy(symbol) builds it, like the
+# STRATEGIES entries, once per side.  Positions are set up on a private game
+# whose player 1 is whoever moves on an even count, so game.to_move() and
+# checkPlayer() point at the side asked about.  Works on any board size.
+class LegacyBatch:
+    def __init__(self, make_strategy, geometry=CLASSIC):
+        self.make_strategy = make_strategy
+        self.geometry = geometry
+        self.strategies = {'X': make_strategy('X')}
+        self.deterministic = getattr(self.strategies['X'], 'deterministic', False)
+
+    def determine_moves(self, x_bits, o_bits, symbols):
+        if isinstance(symbols, str):
+            symbols = [symbols] * len(x_bits)
+        squares = self.geometry.squares
+        game = TicTacToe(AIPlayer('X', None), AIPlayer('O', None), self.geometry.size, self.geometry.win_length)
+        x_first = game.players
+        o_first = x_first[::-1]
+        moves = []
+        for x, o, symbol in zip(x_bits, o_bits, symbols):
+            x, o = int(x), int(o)
+            game.board[:] = ['X' if x >> i & 1 else 'O' if o >> i & 1 else ' ' for i in range(squares)]
+            game.moves = []
+            game.players = x_first if (symbol == 'X') == (game.board.filled % 2 == 0) else o_first
+            strategy = self.strategies.get(symbol)
+            if strategy is None:
+                strategy = self.strategies[symbol] = self.make_strategy(symbol)
+            moves.append(strategy.determine_move(game))
+        return moves
+
+# Strategies another batch strategy plays exactly like.  MinimaxAI takes the
+# lowest optimal square, which is what the solved table gives.
+BATCH_EQUIVALENTS = {
+    MinimaxAI: lambda: SolvedTableAI('X'),
+}
+
+# The fastest batch strategy that plays like STRATEGIES[name]
+def batch_strategy(name, geometry=CLASSIC, seed=None):
+    make_strategy = STRATEGIES[name]
+    if np is not None and geometry is CLASSIC:
+        strategy = make_strategy('X')
+        if hasattr(strategy, 'determine_moves'):
+            return strategy  # takes the side to move from symbols, so one does for both
+        if type(strategy) in BATCH_EQUIVALENTS:
+            return BATCH_EQUIVALENTS[type(strategy)]()
+        if type(strategy) in BATCH_STRATEGIES:
+            return VectorizedBatch(BATCH_STRATEGIES[type(strategy)], seed, getattr(strategy, 'deterministic', False))
+    return LegacyBatch(make_strategy, geometry)
+
+#-------------------------------- Game scheduler ----------------------
+# Plays thousands of games in one process by keeping them all in flight.  Each
+# game is a generator that yields whenever a player has to move and is sent
+# the square back, so no game holds up the others.  Each tick the scheduler
+# collects the positions every waiting game needs a move in and asks each
+# player's batch strategy (see Batch moves) about all of them in one call.
+# Strategies with deterministic = True always pick the same square in the same
+# position, so they're asked about each distinct position only once per tick -
+# with thousands of games going most positions come up many times.  Strategies
+# without it (anything random) are asked once per game.  One strategy object
+# plays every game, so its caches (transposition tables and the like) are
+# shared by all of them.  3x3 only, like the batch strategies.
+SCHEDULER_IN_FLIGHT = 4096
+
+# One game.  symbols are player 1's and player 2's, first_move is player 1's
+# (random, like AIPlayer's).  Yields (x_bits, o_bits, turn) with turn 0 for
+# player 1 and returns (result, moves), result as in play_games.
+def scheduled_game(first_move, symbols):
+    x_bits = o_bits = 0
+    moves = []
+    turn = 0
+    move = first_move
+    while True:
+        if move is None:
+            move = yield x_bits, o_bits, turn
+            filled = x_bits | o_bits
+            if move is None or not 0 <= move < 9 or filled >> int(move) & 1:
+                move = (~filled & FULL_MASK & -~filled).bit_length() - 1  # first open square, like AIPlayer
+            move = int(move)
+        if symbols[turn] == 'X':
+            x_bits |= BIT[move]
+            won = WIN_TABLE[x_bits]
+        else:
+            o_bits |= BIT[move]
+            won = WIN_TABLE[o_bits]
+        moves.append(move)
+        if won:
+            return 1 + turn, moves
+        if x_bits | o_bits == FULL_MASK:
+            return 0, moves
+        turn ^= 1
+        move = None
+
+# numGames games between two batch strategies, player 1 moving first.
+# Returns ([ties, player 1 wins, player 2 wins], positions the games asked
+# about, positions the strategies were actually asked about).
+def play_games_scheduled(strategy1, strategy2, numGames, symbol1='X', seed=None, in_flight=SCHEDULER_IN_FLIGHT):
+    rng = random.Random(seed)
+    strategies = (strategy1, strategy2)
+    symbols = (symbol1, 'O' if symbol1 == 'X' else 'X')
+    wins = [0, 0, 0]
+    requested = asked = 0
+    waiting = []  # (game, (x_bits, o_bits, turn))
+    started = 0
+
+    while waiting or started < numGames:
+        while started < numGames and len(waiting) < in_flight:
+            game = scheduled_game(rng.randrange(9), symbols)
+            waiting.append((game, next(game)))  # a first move never ends the game
+            started += 1
+
+        still_waiting = []
+        for turn in (0, 1):
+            batch = [(game, request) for game, request in waiting if request[2] == turn]
+            if not batch:
+                continue
+            strategy = strategies[turn]
+            positions = [request[:2] for game, request in batch]
+            if getattr(strategy, 'deterministic', False):
+                distinct = list(dict.fromkeys(positions))
+                answers = dict(zip(distinct, strategy.determine_moves([x for x, o in distinct], [o for x, o in distinct],
+                                                                      symbols[turn])))
+                moves = [answers[position] for position in positions]
+            else:
+                distinct = positions
+                moves = strategy.determine_moves([x for x, o in positions], [o for x, o in positions], symbols[turn])
+            requested += len(positions)
+            asked += len(distinct)
+
+            for (game, request), move in zip(batch, moves):
+                try:
+                    still_waiting.append((game, game.send(move)))
+                except StopIteration as finished:
+                    result, _ = finished.value
+                    wins[result] += 1
+        waiting = still_waiting
+    return wins, requested, asked
+
+# schedule [games] [strategy 1] [strategy 2] [games in flight]
+def schedule_command(args):
+    numGames = int(args[0]) if args else 100000
+    name1 = args[1] if len(args) > 1 else 'MinimaxAI'
+    name2 = args[2] if len(args) > 2 else 'RandomAI'
+    in_flight = int(args[3]) if len(args) > 3 else SCHEDULER_IN_FLIGHT
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # some strategies print as they think
+        wins, requested, asked = play_games_scheduled(batch_strategy(name1, seed=1), batch_strategy(name2, seed=2),
+                                                      numGames, seed=0, in_flight=in_flight)
+    elapsed = time.perf_counter() - start_time
+    print(f"{numGames} games in {elapsed:.2f} seconds ({numGames / elapsed:.0f} games/sec), {in_flight} at a time")
+    print(f"Player 1 ({name1}): {wins[1]}   Player 2 ({name2}): {wins[2]}   Ties: {wins[0]}")
+    print(f"{requested} moves, {asked} positions asked ({100 * (1 - asked / requested):.1f}% shared)")
+
+#-------------------------------- Self-play learning ----------------------
+# LearnedAI plays from a table of position values it learned by playing
+# itself.  An entry says how good a position is for the player who just moved
+# there (0 = lost, 1 = won, about 0.5 = drawn), and a move is the open square
+# leading to the best value.  Positions are looked up by canonical index (see
+# the transposition table) so the 8 rotations/reflections share an entry.
+# Small boards get an entry per position; bigger boards have far too many, so
+# their canonical indexes are hashed into 2**LEARN_HASH_BITS entries and
+# positions that collide share a value.
+#
+# Training is TD(0): after each move the value of the mover's previous position
+# is nudged towards the one it just moved to, and at the end of the game the
+# last positions are nudged towards the result.  Exploring moves (epsilon of
+# them) are played but not learned from.  A batch of games is played at once as
+# NumPy arrays, every game moving in the same step.  Needs NumPy to train; the
+# table is read without it.  Only the learn command trains, LearnedAI just
+# reads the table and is only in STRATEGIES once the 3x3 one exists.
+#
+# File layout: LEARN_MAGIC, board size and win length (a byte each), then one
+# byte per entry: value * 255.
+LEARN_MAGIC = b"TTTLRN01"
+LEARN_HASH_BITS = 22
+LEARN_HASH_MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing
+LEARN_MAX_SQUARES = 36  # base-3 indexes of bigger boards don't fit in 64 bits
+LEARN_GAMES = 500000  # default for the learn command
+
+def learned_table_path(geometry):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        f"learned_{geometry.size}x{geometry.size}_{geometry.win_length}.bin")
+
+def learned_entries(geometry):
+    return min(3 ** geometry.squares, 1 << LEARN_HASH_BITS)
+
+# Table entry for a base-3 position index
+def learned_key(geometry, index, perms):
+    if geometry is CLASSIC:
+        return canonical_index(index)
+    pow3 = geometry.pow3
+    digits = [index // pow3[square] % 3 for square in range(geometry.squares)]
+    canonical = min(sum(digits[perm[square]] * pow3[square] for square in range(geometry.squares)) for perm in perms)
+    if 3 ** geometry.squares <= 1 << LEARN_HASH_BITS:
+        return canonical
+    return (canonical * LEARN_HASH_MULTIPLIER) % (1 << 64) >> (64 - LEARN_HASH_BITS)
+
+# learned_key for an array of indexes
+def batch_learned_keys(geometry, indexes, perms):
+    if geometry is CLASSIC:
+        canonical_index(0)  # make sure the table is built
+        return np.frombuffer(_canonical_table, dtype=np.uint16)[indexes].astype(np.int64)
+    pow3 = np.array(geometry.pow3, dtype=np.int64)
+    # weights[square, t] = what a digit on square is worth under transform t, so one product does all 8
+    weights = np.zeros((geometry.squares, len(perms)), dtype=np.int64)
+    for t, perm in enumerate(perms):
+        weights[perm, t] = pow3
+    canonical = (indexes[..., None] // pow3 % 3 @ weights).min(axis=-1)
+    if 3 ** geometry.squares <= 1 << LEARN_HASH_BITS:
+        return canonical
+    hashed = canonical.astype(np.uint64) * np.uint64(LEARN_HASH_MULTIPLIER)  # wraps around like % 2**64
+    return (hashed >> np.uint64(64 - LEARN_HASH_BITS)).astype(np.int64)
+
+# Self-play TD(0).  Returns the values as a float32 array (values=... carries on training one)
+def train_learned_table(geometry, games, values=None, batch=4096, alpha=0.1, epsilon=0.2, seed=None):
+    if np is None:
+        raise ImportError("training LearnedAI needs NumPy (pip install numpy)")
+    if geometry.squares > LEARN_MAX_SQUARES:
+        raise ValueError(f"LearnedAI only learns boards of up to {LEARN_MAX_SQUARES} squares")
+    rng = np.random.default_rng(seed)
+    perms = _d4_permutations(geometry.size)
+    if values is None:
+        values = np.full(learned_entries(geometry), 0.5, dtype=np.float32)
+    squares = geometry.squares
+    pow3 = np.array(geometry.pow3, dtype=np.int64)
+    bits = np.array([1 << square for square in range(squares)], dtype=np.int64)
+    line_masks = np.array(geometry.line_masks, dtype=np.int64)
+
+    # Many games reach the same positions, so each one moves towards the average of its targets
+    def nudge(keys, targets):
+        if len(keys):
+            unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            average = np.bincount(inverse, weights=np.broadcast_to(targets, keys.shape)) / counts
+            values[unique] += alpha * (average - values[unique])
+
+    played = 0
+    while played < games:
+        count = min(batch, games - played)
+        played += count
+        index = np.zeros(count, dtype=np.int64)
+        masks = np.zeros((2, count), dtype=np.int64)  # X's squares, O's squares
+        last = np.full((2, count), -1, dtype=np.int64)  # each side's last position (table entry)
+        live = np.arange(count)  # games still going
+        for ply in range(squares):
+            side = ply & 1
+            rows = np.arange(len(live))
+            open_squares = (masks[0, live] | masks[1, live])[:, None] & bits == 0
+            after = index[live, None] + np.where(open_squares, (side + 1) * pow3, 0)  # taken squares: unchanged
+            keys = batch_learned_keys(geometry, after, perms)
+            explore = rng.random(len(live)) < epsilon
+            scores = np.where(explore[:, None], rng.random(keys.shape), values[keys] + rng.random(keys.shape) * 1e-4)
+            scores[~open_squares] = -1.0
+            moves = scores.argmax(axis=1)
+            key = keys[rows, moves]
+
+            learn = (last[side, live] >= 0) & ~explore
+            nudge(last[side, live[learn]], values[key[learn]])
+            index[live] = after[rows, moves]
+            masks[side, live] |= bits[moves]
+            last[side, live] = key
+
+            mine = masks[side, live]
+            won = ((mine[:, None] & line_masks) == line_masks).any(axis=1)
+            drawn = ~won & ((masks[0, live] | masks[1, live]) == geometry.full_mask)
+            other = last[1 - side, live]
+            nudge(key[won], 1.0)
+            nudge(other[won & (other >= 0)], 0.0)
+            nudge(key[drawn], 0.5)
+            nudge(other[drawn & (other >= 0)], 0.5)
+            live = live[~(won | drawn)]
+            if not len(live):
+                break
+    return values
+
+def save_learned_table(values, geometry, path=None):
+    path = path or learned_table_path(geometry)
+    entries = np.round(np.clip(values, 0, 1) * 255).astype(np.uint8)
+    # write to a temporary file first so readers never see a half-written table
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(LEARN_MAGIC + bytes([geometry.size, geometry.win_length]))
+        f.write(entries.tobytes())
+    os.replace(tmp_path, path)
+    print_on(f"Learned table written to {path}")
+
+class LearnedAI:
+    deterministic = True
+
+    def __init__(self, symbol, path=None):
+        self.symbol = symbol
+        self.path = path  # default: learned_table_path for the board played on
+        self.geometry = None
+        self.values = None  # the table's bytes, read on first use
+        self.perms = None
+
+    # Each process reads the table itself
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['geometry'] = state['values'] = None
+        return state
+
+    def open_table(self, geometry=CLASSIC):
+        path = self.path or learned_table_path(geometry)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"no learned table at {path} - train one with the learn command first")
+        with open(path, 'rb') as f:
+            data = f.read()
+        header = LEARN_MAGIC + bytes([geometry.size, geometry.win_length])
+        if data[:len(header)] != header or len(data) != len(header) + learned_entries(geometry):
+            raise ValueError(f"{path} is not a learned table for {geometry.size}x{geometry.size}, {geometry.win_length} in a row")
+        self.values = data[len(header):]
+        self.geometry = geometry
+        self.perms = _d4_permutations(geometry.size)
+
+    def determine_move(self, game):
+        geometry = game.board.geometry
+        if self.geometry is not geometry:
+            self.open_table(geometry)
+        index = game.board.index
+        filled = game.board.x_bits | game.board.o_bits
+        digit = SYMBOL_VALUE[self.symbol]
+        best_value = -1
+        best_move = None
+        for move in geometry.move_order:  # center and corners first on ties
+            if not filled >> move & 1:
+                value = self.values[learned_key(geometry, index + digit * geometry.pow3[move], self.perms)]
+                if value > best_value:
+                    best_value, best_move = value, move
+        return best_move
+
+    # Batch version (see Batch moves), 3x3 only: every position's nine candidate
+    # positions looked up at once, taken in move_order so ties go the same way
+    def determine_moves(self, x_bits, o_bits, symbols):
+        if self.geometry is not CLASSIC:
+            self.open_table(CLASSIC)
+        x_bits, o_bits = np.asarray(x_bits, dtype=np.intp), np.asarray(o_bits, dtype=np.intp)
+        digits = np.where(batch_is_o(symbols, len(x_bits)), 2, 1)
+        order = np.array(CLASSIC.move_order)
+        taken = ((x_bits | o_bits)[:, None] >> order & 1) != 0
+        index = batch_index(x_bits, o_bits)[:, None]
+        after = np.where(taken, index, index + digits[:, None] * np.array(POW3)[order])
+        values = np.frombuffer(self.values, dtype=np.uint8)[batch_learned_keys(CLASSIC, after, self.perms)].astype(np.int16)
+        values[taken] = -1
+        return order[values.argmax(axis=1)]
+
+def register_learned_ai():
+    STRATEGIES['LearnedAI'] = lambda symbol: LearnedAI(symbol)
+
+if os.path.exists(learned_table_path(CLASSIC)):
+    register_learned_ai()
+
+# learn [games] - trains for BOARD_SIZE / WIN_LENGTH, saves the table and plays it against a few strategies
+def learn_command(args):
+    games = int(args[0]) if args else LEARN_GAMES
+    geometry = board_geometry(BOARD_SIZE, min(WIN_LENGTH, BOARD_SIZE))
+    start_time = time.perf_counter()
+    values = train_learned_table(geometry, games)
+    elapsed = time.perf_counter() - start_time
+    save_learned_table(values, geometry)
+    if geometry is CLASSIC:
+        register_learned_ai()
+    print(f"Trained on {games} self-play games in {elapsed:.2f} seconds ({games / elapsed:.0f} games/sec)")
+    print(f"Table: {learned_entries(geometry)} entries in {learned_table_path(geometry)}")
+
+    opponents = ['SimpleAI', 'RandomAI'] + (['MinimaxAI'] if geometry.squares <= 9 else [])
+    for name in opponents:
+        first = play_games(AIPlayer('X', LearnedAI('X')), AIPlayer('O', STRATEGIES[name]('O')), 200)
+        second = play_games(AIPlayer('X', STRATEGIES[name]('X')), AIPlayer('O', LearnedAI('O')), 200)
+        print(f"vs {name:10s} LearnedAI first: {first[1]} won {first[0]} drawn {first[2]} lost"
+              f"   {name} first: {second[2]} won {second[0]} drawn {second[1]} lost")
+
+#-------------------------------- Benchmarks ----------------------
+# Times determine_move for every strategy in STRATEGIES on a fixed set of
+# positions, so numbers from different runs can be compared.  Each position is
+# timed `repeats` times with a fresh strategy (so a transposition table from
+# the last run doesn't make it look faster) and random seeded the same way.
+# Peak memory is measured on a separate pass under tracemalloc, which slows
+# everything down too much to time with.  Each run is appended to the history
+# file, and anything that got more than `threshold` worse than the last run
+# is flagged.
+BENCH_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_history.jsonl")
+
+BENCH_CORPUS = {
+    'opening': ['         ', '  X O    ', '      X  ', 'X    O   ', '    X O  ', '     X   '],
+    'midgame': ['  O X  X ', '     OXX ', '  X  X  O', ' X  XXOO ', ' X XOX  O', '  OX X   '],
+    'endgame': ['X XOX OO ', '  XXOOXXO', ' OOXX OX ', 'XO  X OXO', ' XXOOX XO', 'XXOX  O O'],
+}
+
+BENCH_MIN_MS = 0.05  # latencies below this are too noisy to flag
+
+# A game set up at the given position, with the side to move worked out from the counts
+def bench_game(position):
+    game = TicTacToe(AIPlayer('X', None), AIPlayer('O', None))
+    game.board[:] = list(position)
+    symbol = 'X' if position.count('X') == position.count('O') else 'O'
+    return game, symbol
+
+# Quietly run one determine_move, returns (seconds, nodes searched)
+def _bench_move(name, position, seed):
+    game, symbol = bench_game(position)
+    strategy = STRATEGIES[name](symbol)
+    stats = attach_stats(strategy)
+    if hasattr(strategy, 'open_table'):  # map the solved table before the clock starts
+        strategy.open_table()
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):  # some strategies print as they think
+        start = time.perf_counter()
+        strategy.determine_move(game)
+        seconds = time.perf_counter() - start
+    return seconds, stats.nodes
+
+def _percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))]
+
+def run_benchmarks(names=None, repeats=3):
+    names = names or list(STRATEGIES)
+    positions = [position for phase in BENCH_CORPUS.values() for position in phase]
+    results = {}
+    for name in names:
+        _bench_move(name, positions[0], 0)  # untimed, so one-time setup (lookup tables etc.) isn't counted
+        samples = []
+        nodes = 0
+        for number, position in enumerate(positions):
+            for repeat in range(repeats):
+                seconds, searched = _bench_move(name, position, number * repeats + repeat)
+                samples.append(seconds)
+                nodes += searched
+        total = sum(samples)
+
+        tracemalloc.start()
+        for number, position in enumerate(positions):
+            _bench_move(name, position, number * repeats)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        samples.sort()
+        results[name] = {'p50_ms': _percentile(samples, 0.5) * 1000, 'p99_ms': _percentile(samples, 0.99) * 1000,
+                         'mean_ms': total / len(samples) * 1000,
+                         'nodes_per_sec': nodes / total if nodes and total > 0 else None,
+                         'peak_kb': peak / 1024}
+    return results
+
+# Everything more than threshold (0.25 = 25%) worse than in the previous run
+def find_regressions(results, previous, threshold=0.25):
+    regressions = []
+    for name, now in results.items():
+        before = previous.get(name)
+        if before is None:
+            continue
+        for key in ('p50_ms', 'p99_ms'):
+            if now[key] > before[key] * (1 + threshold) and now[key] - before[key] > BENCH_MIN_MS:
+                regressions.append(f"{name}: {key} {before[key]:.3f} -> {now[key]:.3f}")
+        if before['nodes_per_sec'] and now['nodes_per_sec'] and now['nodes_per_sec'] < before['nodes_per_sec'] / (1 + threshold):
+            regressions.append(f"{name}: nodes/sec {before['nodes_per_sec']:.0f} -> {now['nodes_per_sec']:.0f}")
+        if now['peak_kb'] > before['peak_kb'] * (1 + threshold) and now['peak_kb'] - before['peak_kb'] > 64:
+            regressions.append(f"{name}: peak memory {before['peak_kb']:.0f} KB -> {now['peak_kb']:.0f} KB")
+    return regressions
+
+def load_bench_history(path=BENCH_HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def save_bench_run(results, path=BENCH_HISTORY_PATH):
+    record = {'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': sys.version.split()[0],
+              'positions': sum(len(phase) for phase in BENCH_CORPUS.values()), 'results': results}
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+def print_benchmarks(results):
+    print(f"{'Strategy':30s}{'p50 ms':>10s}{'p99 ms':>10s}{'mean ms':>10s}{'nodes/sec':>12s}{'peak KB':>10s}")
+    for name, r in results.items():
+        rate = f"{r['nodes_per_sec']:.0f}" if r['nodes_per_sec'] else "-"
+        print(f"{name:30s}{r['p50_ms']:10.3f}{r['p99_ms']:10.3f}{r['mean_ms']:10.3f}{rate:>12s}{r['peak_kb']:10.0f}")
+
+# bench [threshold %] [strategy names...]
+def bench_command(args):
+    threshold = float(args[0]) / 100 if args else 0.25
+    names = args[1:] or None
+    history = load_bench_history()
+    results = run_benchmarks(names)
+    print_benchmarks(results)
+    if history:
+        regressions = find_regressions(results, history[-1]['results'], threshold)
+        print(f"\nCompared with the run of {history[-1]['time']}:")
+        for regression in regressions:
+            print("  REGRESSION  " + regression)
+        if not regressions:
+            print(f"  nothing more than {threshold:.0%} worse")
+    save_bench_run(results)
+    print(f"Results added to {BENCH_HISTORY_PATH}")
+
+#-------------------------------- Move server ----------------------
+# Lets other programs ask for moves without importing this file.  One JSON
+# object per line each way, over TCP or a Unix socket:
+#   -> {"id": 7, "strategy": "MinimaxAI", "board": "X O  X   ", "to_move": "O"}
+#   <- {"id": 7, "move": 8}        or        {"id": 7, "error": "..."}
+# board is the squares in order (' ' or '.' for empty) and can be any n*n size
+# up to SERVE_MAX_SIZE; to_move defaults to whoever has fewer marks, win_length
+# to WIN_LENGTH.  Every size / win length pair builds a geometry that's kept for
+# good, hence the limit.
+# Requests on a connection are answered as they finish, so give them ids if
+# you send several without waiting.  Searches run on a pool of worker
+# processes so the event loop never waits on one; the quick heuristics in
+# SERVE_INLINE are answered in the loop since they take less time than the
+# trip to a worker.
+#
+# A search can't be stopped once a worker has it, so on boards bigger than 3x3
+# (where looking to the end of the game takes far too long) every search has to
+# stop by itself: the deepening ones are built with SERVE_TIME_BUDGET seconds a
+# move (SERVE_BUDGETED), and the ones with no budget that always search to the
+# end (SERVE_CLASSIC_ONLY) are turned down.  Everything else is depth- or
+# playout-limited.
+SERVE_ADDRESS = "127.0.0.1:7878"  # host:port, or a path for a Unix socket
+SERVE_INLINE = {'SimpleAI', 'RandomAI', 'AaronMikeAI', 'JudahsCoolAI'}
+SERVE_MAX_SIZE = 7  # biggest board (squares per side) the server plays on
+SERVE_TIME_BUDGET = 1.0  # seconds a search may take on boards bigger than 3x3
+SERVE_BUDGETED = {
+    'MinimaxAI_depth_Eval(9)': lambda symbol: MinimaxAI_depth_Eval(symbol, 9, time_budget=SERVE_TIME_BUDGET),
+    'AaronMikeMinimax': lambda symbol: AaronMikeMinimax(symbol, time_budget=SERVE_TIME_BUDGET),
+    'MiniMaxDepthGG(5)': lambda symbol: MiniMaxDepthGG(symbol, 5, time_budget=SERVE_TIME_BUDGET),
+    'NoahJudahMiniMax(9)': lambda symbol: NoahJudahMiniMax(9, time_budget=SERVE_TIME_BUDGET),
+}
+SERVE_CLASSIC_ONLY = {'MinimaxAI', 'MiniMaxGG'}
+
+_served_strategies = {}  # (name, symbol, budgeted) -> strategy, kept per process so tables etc. are reused
+
+# The move the named strategy makes in the position - raises ValueError for a bad request
+def serve_move(name, board, to_move=None, win_length=None):
+    if name not in STRATEGIES:
+        raise ValueError(f"unknown strategy {name!r}")
+    board = board.replace('.', ' ')
+    size = math.isqrt(len(board))
+    if size == 0 or size * size != len(board) or set(board) - {' ', 'X', 'O'}:
+        raise ValueError("board must be n*n squares of ' ', 'X' and 'O'")
+    if size > SERVE_MAX_SIZE:
+        raise ValueError(f"board can be at most {SERVE_MAX_SIZE}x{SERVE_MAX_SIZE}")
+    if win_length is not None and (type(win_length) is not int or not 1 <= win_length <= size):
+        raise ValueError(f"win_length must be a whole number from 1 to {size}")
+    if to_move is None:
+        to_move = 'X' if board.count('X') <= board.count('O') else 'O'
+    if to_move not in ('X', 'O'):
+        raise ValueError("to_move must be 'X' or 'O'")
+
+    if size > 3 and name in SERVE_CLASSIC_ONLY:
+        raise ValueError(f"{name} searches to the end of the game, it's only served on 3x3 boards")
+
+    game = TicTacToe(AIPlayer('X', None), AIPlayer('O', None), size, win_length)
+    game.board[:] = list(board)
+    if game.check_win(game.board) or game.is_board_full():
+        raise ValueError("the game is already over")
+    budgeted = size > 3 and name in SERVE_BUDGETED
+    strategy = _served_strategies.get((name, to_move, budgeted))
+    if strategy is None:
+        make = SERVE_BUDGETED[name] if budgeted else STRATEGIES[name]
+        strategy = _served_strategies[(name, to_move, budgeted)] = make(to_move)
+    with contextlib.redirect_stdout(io.StringIO()):  # some strategies print as they think
+        move = strategy.determine_move(game)
+    if type(move) is not int or not 0 <= move < len(board) or board[move] != ' ':
+        raise ValueError(f"{name} suggested an invalid move: {move!r}")
+    return move
+
+# ("tcp", host, port) or ("unix", path)
+def parse_address(address):
+    host, colon, port = address.rpartition(':')
+    if colon and port.isdigit() and '/' not in address:
+        return "tcp", host or "127.0.0.1", int(port)
+    return "unix", address
+
+async def open_connection(address):
+    kind, *where = parse_address(address)
+    if kind == "tcp":
+        return await asyncio.open_connection(*where)
+    return await asyncio.open_unix_connection(*where)
+
+class MoveServer:
+    def __init__(self, address=SERVE_ADDRESS, workers=0):
+        self.address = address
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+        self.requests = 0
+
+    async def answer(self, line, writer):
+        reply = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            reply['id'] = request.get('id')
+            if 'strategy' not in request or 'board' not in request:
+                raise ValueError("a request needs a strategy and a board")
+            args = (request['strategy'], request['board'], request.get('to_move'), request.get('win_length'))
+            if args[0] in SERVE_INLINE:
+                reply['move'] = serve_move(*args)
+            else:
+                reply['move'] = await asyncio.get_running_loop().run_in_executor(self.pool, serve_move, *args)
+        except Exception as error:  # anything a strategy raises goes back to the client
+            reply['error'] = str(error) or type(error).__name__
+        self.requests += 1
+        try:
+            writer.write((json.dumps(reply) + "\n").encode())
+            await writer.drain()
+        except ConnectionError:
+            pass  # the client went away
+
+    async def handle(self, reader, writer):
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.answer(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        except (ConnectionError, ValueError):  # reset, or a line longer than the stream limit
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        kind, *where = parse_address(self.address)
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as self.pool:
+            if kind == "tcp":
+                server = await asyncio.start_server(self.handle, *where, backlog=4096)
+            else:
+                if os.path.exists(where[0]):
+                    os.unlink(where[0])  # left over from a server that didn't shut down cleanly
+                server = await asyncio.start_unix_server(self.handle, *where, backlog=4096)
+            print(f"Serving moves on {self.address} with {self.workers} worker processes (Ctrl-C to stop)")
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                if kind == "unix" and os.path.exists(where[0]):
+                    os.unlink(where[0])
+
+# serve [address] - NUM_WORKERS worker processes (0 = one per core)
+def serve_command(args):
+    server = MoveServer(args[0] if args else SERVE_ADDRESS, NUM_WORKERS)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print(f"\n{server.requests} requests answered")
+
+# One client: connect, then send requests one at a time and time each answer
+async def _load_client(address, strategy, requests, positions, first, latencies, failures):
+    try:
+        reader, writer = await open_connection(address)
+    except OSError:
+        failures[0] += requests
+        return
+    number = 0
+    try:
+        for number in range(requests):
+            position = positions[(first + number) % len(positions)]
+            start = time.perf_counter()
+            writer.write((json.dumps({'id': number, 'strategy': strategy, 'board': position}) + "\n").encode())
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                failures[0] += requests - number
+                return
+            latencies.append(time.perf_counter() - start)
+            if 'error' in json.loads(line):
+                failures[1] += 1
+    except ConnectionError:
+        failures[0] += requests - number
+    finally:
+        writer.close()
+
+async def run_load(address, clients, requests, strategy):
+    positions = [position for phase in BENCH_CORPUS.values() for position in phase]
+    latencies = []
+    failures = [0, 0]  # requests lost to connection trouble, error replies
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_client(address, strategy, requests, positions, client, latencies, failures)
+                           for client in range(clients)))
+    return time.perf_counter() - start, sorted(latencies), failures
+
+# loadgen [clients] [requests per client] [strategy] [address] - against a running 'serve'
+def loadgen_command(args):
+    clients = int(args[0]) if args else 1000
+    requests = int(args[1]) if len(args) > 1 else 10
+    strategy = args[2] if len(args) > 2 else 'MinimaxAI'
+    address = args[3] if len(args) > 3 else SERVE_ADDRESS
+    seconds, latencies, failures = asyncio.run(run_load(address, clients, requests, strategy))
+    print(f"{clients} clients x {requests} requests of {strategy} to {address}: {len(latencies)} answered in {seconds:.2f} s")
+    if latencies:
+        print(f"{len(latencies) / seconds:.0f} requests/sec   latency ms  p50 {_percentile(latencies, 0.5) * 1000:.2f}"
+              f"  p99 {_percentile(latencies, 0.99) * 1000:.2f}  p99.9 {_percentile(latencies, 0.999) * 1000:.2f}"
+              f"  max {latencies[-1] * 1000:.2f}")
+    if failures[0] or failures[1]:
+        print(f"{failures[0]} requests lost to connection errors, {failures[1]} error replies")
+
+# Tools run from the command line:  python "Tic Tac Toe AI - Python.py" <command> [args]
+COMMANDS = {
+    'tournament': tournament_command,   # [games per pairing] [--scheduled] [--shared-tt]
+    'simulate': simulate_command,       # [games] [strategy 1] [strategy 2] - NumPy batch simulator
+    'bench': bench_command,             # [regression threshold %] [strategy names...]
+    'log': log_command,                 # <game log file> [tie|player1|player2] [games to show]
+    'serve': serve_command,             # [host:port or Unix socket path] - JSON-lines move server
+    'loadgen': loadgen_command,         # [clients] [requests per client] [strategy] [address]
+    'learn': learn_command,             # [self-play games] - trains LearnedAI for BOARD_SIZE / WIN_LENGTH
+    'tune': tune_command,               # [grid|random|evolve] [candidates or generations] [games per round]
+    'schedule': schedule_command,       # [games] [strategy 1] [strategy 2] [games in flight] - many games in one process
+    'audit': audit_command,             # [strategy names...] - blunders against the solved game, by phase
+}
 
 ###############################################################
 # MAIN
 ################################################################
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        sys.exit()
+
     # Here you can decide how to initialize players
     # For example, to test with one human and one AI:
     # player1 = HumanPlayer('X')
@@ -1182,14 +4350,14 @@ if __name__ == "__main__":
     #player1 = AIPlayer('O', MinimaxAI('O'))  
     #player2 = AIPlayer('O', MinimaxAI_depth('O', 1))  
     #player1 = AIPlayer('X', MiniMaxGG(9))
+    #player1 = AIPlayer('X', SolvedTableAI('X'))  # perfect play from the precomputed table
+    #player1 = AIPlayer('X', MinimaxAI_depth_Eval('X', time_budget=0.05))  # as deep as 50 ms per move allows
     
     # ************ SET PLAYERS HERE **************************
     player1 = AIPlayer('X', MinimaxAI_depth_Eval('X', 9)) 
     player2 = AIPlayer('O', MiniMaxDepthGG('O', 5))
     # ********************************************************
 
-    wins = [0,0,0]   # 0 - ties, 1 - p1, 2 - p2
-
     # Print some instructions
 
     print()
@@ -1199,32 +4367,29 @@ if __name__ == "__main__":
     print ("set DRAW_GRAPHICS = True to see the board in graphics.")
     print ("set PRINT_ON = True to see text output.")
     print ("set DEBUG_PRINT_ON = True to get detailed debug information.")
+    print ("set NUM_WORKERS to play the games on several processes (0 = all cores).")
+    print ("set GAME_LOG_PATH to record every game (read it back with the 'log' command).")
     print ("NOTE: TURNING ON ANY OF THE ABOVE OPTIONS WILL GREATLY SLOW PLAY.")
     print(); print()
 
     numGames = int(input("How many games to play? "))
 
+    # "--scaling" measures games/sec from 1 process up to every core instead
+    if "--scaling" in sys.argv:
+        parallel_scaling(player1, player2, numGames)
+        sys.exit()
+
     #start timer
     start_time = time.perf_counter()
 
-    for currGame in range (1,numGames+1):
-        game = TicTacToe(player1, player2)
-        print_on(f"Game starting... {currGame} \n")
-        print_on ("#############")
-        winner = game.play()
-
-        #keep count of the number of wins
-        if winner == "X" and player1.symbol == "X": wins[1]= wins[1] + 1
-        if winner == "X" and player2.symbol == "X": wins[2]= wins[2] + 1
-
-        if winner == "O" and player1.symbol == "O": wins[1]= wins[1] + 1
-        if winner == "O" and player2.symbol == "O": wins[2]= wins[2] + 1
-
-        if winner == "tie": wins[0]= wins[0] + 1
-
-        #reset move count to one after each game so the games are not always the same due to starting on same square each game
-        player1.movecount = 1
-        player2.movecount = 1
+    log = GameLogWriter(GAME_LOG_PATH) if GAME_LOG_PATH else None
+    if NUM_WORKERS == 1:
+        wins = play_games(player1, player2, numGames, log=log)
+    else:
+        wins = play_games_parallel(player1, player2, numGames, NUM_WORKERS, log=log)
+    if log is not None:
+        log.close()
+        print(f"{log.games} games logged to {GAME_LOG_PATH}")
 
     #end timer
     end_time = time.perf_counter()
@@ -1237,6 +4402,8 @@ if __name__ == "__main__":
     print ("Ties    : ", wins[0], round((wins[0]/numGames)*100), "%")
     print ()
 
-    if DRAW_GRAPHICS: input("press any key ... ")  # delay to keep graphic screen open
+    if DRAW_GRAPHICS:
+        get_renderer().flush()  # make sure the last board is on screen
+        input("press any key ... ")  # delay to keep graphic screen open
 
 
@@ -0,0 +1,25 @@
+import importlib.util
+import os
+
+import pytest
+
+PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Tic Tac Toe AI - Python.py")
+spec = importlib.util.spec_from_file_location("tictactoe", PATH)
+tictactoe = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tictactoe)
+
+
+def test_symmetric_chain_middle_player_rates_zero():
+    # A beats B by the same margin that B beats C
+    records = {('A', 'B'): (60, 20, 20), ('B', 'C'): (60, 20, 20)}
+    ratings = tictactoe.bradley_terry(['A', 'B', 'C'], records)
+    assert ratings['B'] == pytest.approx(0, abs=1e-3)
+    assert ratings['A'] == pytest.approx(-ratings['C'], abs=1e-3)
+    assert ratings['A'] > 0
+
+
+def test_point_estimate_inside_interval_when_one_sided():
+    results = {('A', 'B'): [0, 100, 0], ('B', 'A'): [0, 0, 100],
+               ('B', 'C'): [10, 60, 30], ('C', 'B'): [10, 30, 60]}
+    for rating, low, high in tictactoe.tournament_ratings(results, samples=50).values():
+        assert low <= rating <= high
@@ -0,0 +1,31 @@
+import importlib.util
+import os
+import time
+
+import pytest
+
+PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Tic Tac Toe AI - Python.py")
+spec = importlib.util.spec_from_file_location("tictactoe", PATH)
+tictactoe = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tictactoe)
+
+
+@pytest.mark.parametrize("name", ['MinimaxAI_depth_Eval(9)', 'AaronMikeMinimax', 'MiniMaxDepthGG(5)',
+                                  'NoahJudahMiniMax(9)', 'Felix_Jesse_Depth_limit(3)', 'MCTS(2000)'])
+def test_5x5_request_comes_back_within_the_deadline(name, monkeypatch):
+    monkeypatch.setattr(tictactoe, 'SERVE_TIME_BUDGET', 0.2)
+    start = time.perf_counter()
+    move = tictactoe.serve_move(name, ' ' * 25, None, 5)
+    assert time.perf_counter() - start < 2.0
+    assert 0 <= move < 25
+
+
+@pytest.mark.parametrize("name", sorted(tictactoe.SERVE_CLASSIC_ONLY))
+def test_full_depth_search_turned_down_above_3x3(name):
+    with pytest.raises(ValueError):
+        tictactoe.serve_move(name, ' ' * 25, None, 5)
+
+
+def test_3x3_still_served_in_full():
+    board = 'X O  X   '
+    assert tictactoe.serve_move('MinimaxAI', board, 'O') == tictactoe.serve_move('SolvedTableAI', board, 'O')